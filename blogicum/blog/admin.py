@@ -1,12 +1,43 @@
 from django.contrib import admin
 
-from .models import Post, Category, Comment, Location
+from .images import enqueue_variants, mark_image_changed
+from .models import Post, Category, Comment, ImageTask, Location
+from .publishing import set_categories_published
 
-admin.site.register(Category)
 admin.site.register(Comment)
 admin.site.register(Location)
 
 
+class CategoryAdmin(admin.ModelAdmin):
+    list_display = (
+        'title',
+        'slug',
+        'is_published',
+    )
+    actions = ('publish_categories', 'unpublish_categories')
+
+    def _set_published(self, request, queryset, is_published):
+        categories, posts = set_categories_published(
+            queryset.values_list('pk', flat=True), is_published
+        )
+        self.message_user(
+            request,
+            f'Изменено категорий: {categories}, '
+            f'публикаций затронуто: {posts}.'
+        )
+
+    @admin.action(description='Опубликовать выбранные категории')
+    def publish_categories(self, request, queryset):
+        self._set_published(request, queryset, True)
+
+    @admin.action(description='Снять с публикации выбранные категории')
+    def unpublish_categories(self, request, queryset):
+        self._set_published(request, queryset, False)
+
+
+admin.site.register(Category, CategoryAdmin)
+
+
 class PostAdmin(admin.ModelAdmin):
     list_display = (
         'title',
@@ -15,6 +46,8 @@ class PostAdmin(admin.ModelAdmin):
         'created_at',
         'category',
         'location',
+        'image_status',
+        'comment_count',
     )
     list_editable = (
         'is_published',
@@ -23,5 +56,28 @@ class PostAdmin(admin.ModelAdmin):
     list_filter = ('category',)
     list_display_links = ('title',)
 
+    def save_model(self, request, obj, form, change):
+        image_changed = 'image' in form.changed_data
+        if image_changed:
+            mark_image_changed(obj, form.initial.get('image'))
+        super().save_model(request, obj, form, change)
+        if image_changed and obj.image:
+            enqueue_variants(obj)
+
 
 admin.site.register(Post, PostAdmin)
+
+
+class ImageTaskAdmin(admin.ModelAdmin):
+    list_display = (
+        'image',
+        'status',
+        'attempts',
+        'run_after',
+        'updated_at',
+    )
+    list_filter = ('status',)
+    readonly_fields = ('post', 'image', 'last_error')
+
+
+admin.site.register(ImageTask, ImageTaskAdmin)
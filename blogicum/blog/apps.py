@@ -5,3 +5,12 @@ class BlogConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'blog'
     verbose_name = 'Блог'
+
+    def ready(self):
+        from django.conf import settings
+
+        from . import signals  # noqa: F401
+        from .templating import precompile_templates
+
+        if settings.PRECOMPILE_TEMPLATES:
+            precompile_templates()
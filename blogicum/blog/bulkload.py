@@ -0,0 +1,212 @@
+import json
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+
+from django.apps import apps
+from django.core.management import call_command
+from django.core.management.color import no_style
+from django.db import connections, transaction
+from django.utils import timezone
+
+from .cache import GLOBAL_SCOPE, invalidate
+from .search import sqlite_index_deferred
+
+
+def _skip_separators(buffer, position):
+    while position < len(buffer) and buffer[position] in ' \t\r\n,':
+        position += 1
+    return position
+
+
+def _decode_items(decoder, buffer, final):
+    """Разбирает дочитанные объекты; возвращает их и остаток буфера."""
+    items = []
+    position = _skip_separators(buffer, 0)
+    while position < len(buffer) and buffer[position] != ']':
+        if buffer[position] != '{':
+            raise ValueError(
+                f'Элемент фикстуры должен быть объектом: '
+                f'{buffer[position:position + 20]!r}'
+            )
+        try:
+            item, position = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            # Объект ещё не дочитан.
+            if final:
+                raise
+            break
+        items.append(item)
+        position = _skip_separators(buffer, position)
+    return items, buffer[position:]
+
+
+def iter_json_array(stream, chunk_size=64 * 1024):
+    """Читает объекты из JSON-массива по одному, не загружая файл целиком.
+
+    Годится для фикстур Django: элементы массива — словари.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ''
+    while not buffer.strip():
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        buffer += chunk
+    buffer = buffer.lstrip()
+    if not buffer.startswith('['):
+        raise ValueError('Фикстура должна быть JSON-массивом.')
+    buffer = buffer[1:]
+    while True:
+        chunk = stream.read(chunk_size)
+        items, buffer = _decode_items(decoder, buffer + chunk, not chunk)
+        yield from items
+        if not chunk:
+            if buffer.strip() not in ('', ']'):
+                raise ValueError('Фикстура оборвана.')
+            return
+
+
+def timestamp_fields(models):
+    return [
+        field for model in models for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now', False)
+        or getattr(field, 'auto_now_add', False)
+    ]
+
+
+@contextmanager
+def keep_timestamps(fields):
+    """Сохраняет заданные значения полей auto_now и auto_now_add.
+
+    bulk_create, в отличие от loaddata, заполняет их текущим временем.
+    """
+    flags = [(field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, (auto_now, auto_now_add) in zip(fields, flags):
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+def reset_sequences(models, using):
+    # Строки вставлены с явными ключами: последовательности PostgreSQL
+    # об этом не знают.
+    db = connections[using]
+    statements = db.ops.sequence_reset_sql(no_style(), list(models))
+    if statements:
+        with db.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
+
+
+class BulkLoader:
+    """Копит объекты по моделям и пишет их пачками через bulk_create.
+
+    Сигналы моделей не отправляются. Строки с уже существующим
+    первичным ключом обновляются, как это делает loaddata.
+    """
+
+    def __init__(self, using, batch_size, timestamps=()):
+        self.using = using
+        self.batch_size = batch_size
+        self.timestamps = defaultdict(list)
+        for field in timestamps:
+            self.timestamps[field.model].append(field)
+        self.pending = defaultdict(list)
+        self.counts = Counter()
+        self.models = set()
+
+    def add(self, obj):
+        model = type(obj)
+        if model._meta.parents:
+            # bulk_create не умеет наследование таблиц.
+            self.fill_timestamps(model, [obj])
+            obj.save_base(using=self.using, raw=True)
+            self.models.add(model)
+            self.counts[model._meta.label] += 1
+            return
+        self.pending[model].append(obj)
+        if len(self.pending[model]) >= self.batch_size:
+            self.flush(model)
+
+    def add_m2m(self, obj, m2m_data):
+        for name, values in m2m_data.items():
+            field = obj._meta.get_field(name)
+            through = field.remote_field.through
+            source = f'{field.m2m_field_name()}_id'
+            target = f'{field.m2m_reverse_field_name()}_id'
+            for value in values:
+                self.add(through(**{source: obj.pk, target: value}))
+
+    def fill_timestamps(self, model, objs):
+        # Поля, которых нет в данных (например, добавленные после выгрузки
+        # фикстуры), заполняются текущим временем, как при обычной записи.
+        fields = self.timestamps.get(model)
+        if not fields:
+            return
+        now = timezone.now()
+        for obj in objs:
+            for field in fields:
+                if getattr(obj, field.attname) is None:
+                    setattr(obj, field.attname, now)
+
+    def flush(self, model=None):
+        for model in [model] if model else list(self.pending):
+            objs = self.pending.pop(model, [])
+            if objs:
+                self.write(model, objs)
+
+    def write(self, model, objs):
+        manager = model._base_manager.using(self.using)
+        self.fill_timestamps(model, objs)
+        pks = [obj.pk for obj in objs if obj.pk is not None]
+        existing = set(
+            manager.filter(pk__in=pks).values_list('pk', flat=True)
+        ) if pks else set()
+        if existing:
+            manager.bulk_update(
+                [obj for obj in objs if obj.pk in existing],
+                [
+                    field.name for field in model._meta.concrete_fields
+                    if not field.primary_key
+                ],
+                batch_size=self.batch_size
+            )
+        manager.bulk_create(
+            [obj for obj in objs if obj.pk not in existing],
+            batch_size=self.batch_size,
+            # Связи многие-ко-многим могут уже быть в базе.
+            ignore_conflicts=bool(model._meta.auto_created)
+        )
+        self.models.add(model)
+        self.counts[model._meta.label] += len(objs)
+
+
+@contextmanager
+def bulk_loading(using, batch_size):
+    """Открывает загрузку: одна транзакция, проверка внешних ключей в конце.
+
+    Индекс поиска перестраивается после загрузки, временные метки
+    берутся из данных.
+    """
+    db = connections[using]
+    timestamps = timestamp_fields(apps.get_models())
+    loader = BulkLoader(using, batch_size, timestamps)
+    with sqlite_index_deferred(using), keep_timestamps(timestamps):
+        with transaction.atomic(using=using):
+            with db.constraint_checks_disabled():
+                yield loader
+                loader.flush()
+            db.check_constraints(table_names=[
+                model._meta.db_table for model in loader.models
+            ])
+            reset_sequences(loader.models, using)
+
+
+def rebuild_derived_data(batch_size, stdout=None):
+    """Пересчитывает то, что обычно поддерживают сигналы."""
+    call_command('rebuild_feed', batch_size=batch_size, stdout=stdout)
+    call_command('recount_comments', batch_size=batch_size, stdout=stdout)
+    invalidate(GLOBAL_SCOPE)
@@ -0,0 +1,173 @@
+import hashlib
+import time
+from datetime import datetime, timezone
+
+from django.core.cache import cache
+
+from .models import Category, User
+
+GENERATION_KEY = 'blog:generation:{}'
+PAGE_KEY = 'blog:page:{}:{}:{}'
+CARD_KEY = 'blog:card:{}:{}:{}'
+HITS_KEY = 'blog:stats:hits'
+MISSES_KEY = 'blog:stats:misses'
+RATE_LIMITED_KEY = 'blog:stats:rate_limited'
+COALESCED_KEY = 'blog:stats:coalesced'
+BATCHES_KEY = 'blog:stats:batches'
+# Поколение заводится и для несуществующих категорий, профилей и
+# публикаций: без срока такие ключи копились бы бесконечно. Истёкшее
+# поколение заменяется новым, это стоит только промаха кэша страниц.
+GENERATION_TIMEOUT = 60 * 60
+
+# Меняется при правке категорий и местоположений: их данные есть
+# в карточках любой ленты.
+GLOBAL_SCOPE = 'all'
+INDEX_SCOPE = 'index'
+
+
+def category_scope(slug):
+    return f'category:{slug}'
+
+
+def profile_scope(username):
+    return f'profile:{username}'
+
+
+def post_scope(post_id):
+    return f'post:{post_id}'
+
+
+def post_scopes(*posts):
+    """Области кэша страниц, на которых показываются переданные публикации."""
+    category_ids = {post.category_id for post in posts} - {None}
+    author_ids = {post.author_id for post in posts}
+    slugs = Category.objects.filter(
+        pk__in=category_ids
+    ).values_list('slug', flat=True)
+    usernames = User.objects.filter(
+        pk__in=author_ids
+    ).values_list('username', flat=True)
+    return (
+        INDEX_SCOPE,
+        *map(category_scope, slugs),
+        *map(profile_scope, usernames),
+        *map(post_scope, {post.pk for post in posts}),
+    )
+
+
+def get_generations(*scopes):
+    """Возвращает поколения областей кэша, заводя недостающие.
+
+    Новое поколение берётся из текущего времени, поэтому вытесненный
+    ключ не может вернуться к старому значению и «оживить» старые страницы.
+    """
+    keys = [GENERATION_KEY.format(scope) for scope in scopes]
+    generations = cache.get_many(keys)
+    missing = {key: time.time_ns() for key in keys if key not in generations}
+    if missing:
+        cache.set_many(missing, GENERATION_TIMEOUT)
+        generations.update(missing)
+    return [generations[key] for key in keys]
+
+
+def generations_last_modified(generations):
+    """Last-Modified страницы с данными поколениями или None.
+
+    В заголовке время с точностью до секунды, поэтому берётся следующая
+    за поколением секунда, и только когда она уже наступила: иначе правка
+    в ту же секунду не изменила бы заголовок, и If-Modified-Since получил
+    бы ложный ответ 304.
+    """
+    seconds = max(generations) // 10 ** 9 + 1
+    if seconds > time.time():
+        return None
+    return datetime.fromtimestamp(seconds, timezone.utc)
+
+
+def invalidate(*scopes):
+    now = time.time_ns()
+    cache.set_many(
+        {GENERATION_KEY.format(scope): now for scope in scopes},
+        GENERATION_TIMEOUT
+    )
+
+
+def page_cache_key(scope, full_path):
+    generations = ':'.join(
+        str(generation)
+        for generation in get_generations(GLOBAL_SCOPE, scope)
+    )
+    path_hash = hashlib.md5(full_path.encode()).hexdigest()
+    return PAGE_KEY.format(scope, path_hash, generations)
+
+
+def card_cache_key(post, generation):
+    """Ключ карточки публикации.
+
+    save() меняет updated_at, а счётчик комментариев и статус копий
+    изображения обновляются в обход него, поэтому входят в ключ отдельно.
+    Категории, местоположения и имена авторов учитывает поколение
+    GLOBAL_SCOPE.
+    """
+    version = (
+        f'{post.updated_at.timestamp()}:{post.comment_count}:'
+        f'{post.image_status}'
+    )
+    return CARD_KEY.format(post.pk, version, generation)
+
+
+def _increment(key, delta=1):
+    cache.add(key, 0, None)
+    try:
+        cache.incr(key, delta)
+    except ValueError:
+        cache.set(key, delta, None)
+
+
+def record_hit():
+    _increment(HITS_KEY)
+
+
+def record_miss():
+    _increment(MISSES_KEY)
+
+
+def get_stats():
+    stats = cache.get_many((HITS_KEY, MISSES_KEY))
+    hits = stats.get(HITS_KEY, 0)
+    misses = stats.get(MISSES_KEY, 0)
+    total = hits + misses
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hit_rate': hits / total if total else 0.0,
+    }
+
+
+def reset_stats():
+    cache.delete_many((HITS_KEY, MISSES_KEY))
+
+
+def record_rate_limited():
+    _increment(RATE_LIMITED_KEY)
+
+
+def record_coalesced(count):
+    _increment(COALESCED_KEY, count)
+    _increment(BATCHES_KEY)
+
+
+def get_write_stats():
+    stats = cache.get_many((RATE_LIMITED_KEY, COALESCED_KEY, BATCHES_KEY))
+    coalesced = stats.get(COALESCED_KEY, 0)
+    batches = stats.get(BATCHES_KEY, 0)
+    return {
+        'rate_limited': stats.get(RATE_LIMITED_KEY, 0),
+        'coalesced': coalesced,
+        'batches': batches,
+        'batch_size': coalesced / batches if batches else 0.0,
+    }
+
+
+def reset_write_stats():
+    cache.delete_many((RATE_LIMITED_KEY, COALESCED_KEY, BATCHES_KEY))
@@ -0,0 +1,27 @@
+import re
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+PRAGMA_NAME = re.compile(r'^[a-z_]+$')
+PRAGMA_VALUE = re.compile(r'^-?\w+$')
+
+
+def apply_sqlite_pragmas(connection, pragmas=None):
+    """Выполняет PRAGMA из настроек на новом соединении с SQLite."""
+    if connection.vendor != 'sqlite':
+        return
+    if pragmas is None:
+        pragmas = settings.SQLITE_PRAGMAS
+    with connection.cursor() as cursor:
+        for name, value in pragmas.items():
+            # Параметры в PRAGMA не подставляются, поэтому значения
+            # проверяются перед форматированием.
+            valid = PRAGMA_NAME.match(name) and PRAGMA_VALUE.match(
+                str(value)
+            )
+            if not valid:
+                raise ImproperlyConfigured(
+                    f'Некорректная настройка SQLite: {name}={value!r}.'
+                )
+            cursor.execute(f'PRAGMA {name} = {value}')
@@ -0,0 +1,180 @@
+import hashlib
+
+from django.conf import settings
+from django.contrib.syndication.views import Feed
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils.feedgenerator import Atom1Feed
+from django.utils.text import Truncator
+from django.views.decorators.http import condition
+
+from .cache import (
+    GLOBAL_SCOPE,
+    INDEX_SCOPE,
+    category_scope,
+    generations_last_modified,
+    get_generations,
+    page_cache_key,
+    profile_scope,
+    record_hit,
+    record_miss
+)
+from .models import Category, FeedEntry, Post, User
+from .views import FEED_ORDERING, output_published
+
+NUMBER_OF_ITEMS = 20
+DESCRIPTION_WORDS = 50
+
+
+def feed_posts(entries):
+    post_ids = entries.order_by(*FEED_ORDERING).values_list(
+        'post_id', flat=True
+    )[:NUMBER_OF_ITEMS]
+    return output_published(Post.objects.filter(pk__in=list(post_ids)))
+
+
+class CachedFeed(Feed):
+    """Лента, которая кэшируется и отвечает на условные запросы.
+
+    Как и у страниц лент, валидаторы и ключ кэша берутся из поколений
+    областей кэша. Лента не зависит от читателя, поэтому её кэш общий.
+    """
+
+    def get_cache_scope(self, **kwargs):
+        raise NotImplementedError
+
+    def get_etag(self, request, *args, **kwargs):
+        generations = get_generations(
+            GLOBAL_SCOPE, self.get_cache_scope(**kwargs)
+        )
+        return hashlib.md5(
+            ':'.join(map(str, generations)).encode()
+        ).hexdigest()
+
+    def get_last_modified(self, request, *args, **kwargs):
+        return generations_last_modified(get_generations(
+            GLOBAL_SCOPE, self.get_cache_scope(**kwargs)
+        ))
+
+    def render(self, request, *args, **kwargs):
+        # Ссылки в ленте абсолютные: адрес с хостом и схемой входит в ключ.
+        key = page_cache_key(
+            self.get_cache_scope(**kwargs), request.build_absolute_uri()
+        )
+        content = cache.get(key)
+        if content is None:
+            record_miss()
+            content = super().__call__(request, *args, **kwargs).content
+            cache.set(key, content, settings.FEED_CACHE_TIMEOUT)
+        else:
+            record_hit()
+        # Ответ собирается заново и в обоих случаях получает Last-Modified
+        # из поколений, а не из даты последней публикации.
+        return HttpResponse(
+            content, content_type=self.feed_type.content_type
+        )
+
+    def __call__(self, request, *args, **kwargs):
+        return condition(
+            etag_func=self.get_etag,
+            last_modified_func=self.get_last_modified
+        )(self.render)(request, *args, **kwargs)
+
+    def item_title(self, item):
+        return item.title
+
+    def item_description(self, item):
+        return Truncator(item.text).words(DESCRIPTION_WORDS)
+
+    def item_pubdate(self, item):
+        return item.pub_date
+
+    def item_updateddate(self, item):
+        return item.updated_at
+
+    def item_author_name(self, item):
+        return item.author.username
+
+    def item_categories(self, item):
+        return [item.category.title]
+
+
+class LatestPostsFeed(CachedFeed):
+    title = 'Блогикум'
+    description = 'Новые публикации Блогикума.'
+
+    def get_cache_scope(self, **kwargs):
+        return INDEX_SCOPE
+
+    def link(self):
+        return reverse('blog:index')
+
+    def items(self):
+        return feed_posts(FeedEntry.objects.all())
+
+
+class CategoryPostsFeed(CachedFeed):
+
+    def get_cache_scope(self, category_slug, **kwargs):
+        return category_scope(category_slug)
+
+    def get_object(self, request, category_slug):
+        return get_object_or_404(
+            Category, slug=category_slug, is_published=True
+        )
+
+    def title(self, category):
+        return f'Блогикум: {category.title}'
+
+    def description(self, category):
+        return category.description
+
+    def link(self, category):
+        return reverse('blog:category_posts', args=[category.slug])
+
+    def items(self, category):
+        return feed_posts(category.feed_entries.all())
+
+
+class AuthorPostsFeed(CachedFeed):
+
+    def get_cache_scope(self, username, **kwargs):
+        return profile_scope(username)
+
+    def get_object(self, request, username):
+        return get_object_or_404(User, username=username)
+
+    def title(self, author):
+        return f'Блогикум: публикации {author.username}'
+
+    def description(self, author):
+        return f'Новые публикации пользователя {author.username}.'
+
+    def link(self, author):
+        return reverse('blog:profile', args=[author.username])
+
+    def items(self, author):
+        return output_published(
+            author.posts.all(), skip_filter=False
+        )[:NUMBER_OF_ITEMS]
+
+
+class LatestPostsAtomFeed(LatestPostsFeed):
+    feed_type = Atom1Feed
+    subtitle = LatestPostsFeed.description
+
+
+class CategoryPostsAtomFeed(CategoryPostsFeed):
+    feed_type = Atom1Feed
+
+    def subtitle(self, category):
+        return self.description(category)
+
+
+class AuthorPostsAtomFeed(AuthorPostsFeed):
+    feed_type = Atom1Feed
+
+    def subtitle(self, author):
+        return self.description(author)
@@ -0,0 +1,164 @@
+from datetime import timedelta
+from io import BytesIO
+from pathlib import PurePosixPath
+
+from django.core.files.base import ContentFile
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from PIL import Image, ImageOps, features
+
+from .cache import invalidate, post_scopes
+from .models import ImageTask, Post
+
+IMAGE_WIDTHS = (320, 640, 960)
+IMAGE_QUALITY = 80
+MAX_ATTEMPTS = 5
+RETRY_DELAY = timedelta(seconds=30)
+# (расширение, формат Pillow, MIME-тип) в порядке предпочтения браузером.
+VARIANT_FORMATS = tuple(
+    variant for variant in (
+        ('webp', 'WEBP', 'image/webp'),
+        ('jpg', 'JPEG', 'image/jpeg'),
+    )
+    if variant[1] != 'WEBP' or features.check('webp')
+)
+
+
+def variant_name(name, width, extension):
+    path = PurePosixPath(name)
+    return str(path.with_name(f'{path.stem}_w{width}.{extension}'))
+
+
+def variant_url(image_field, width, extension):
+    return image_field.storage.url(
+        variant_name(image_field.name, width, extension)
+    )
+
+
+def generate_variants(image_field):
+    """Сохраняет уменьшенные копии изображения рядом с оригиналом.
+
+    Копии перекодируются без EXIF и не увеличиваются сверх размера
+    оригинала.
+    """
+    storage = image_field.storage
+    with image_field.open('rb') as file:
+        image = Image.open(file)
+        image = ImageOps.exif_transpose(image).convert('RGB')
+    for width in IMAGE_WIDTHS:
+        resized = image.copy()
+        resized.thumbnail((width, width * 4))
+        for extension, image_format, _ in VARIANT_FORMATS:
+            buffer = BytesIO()
+            resized.save(buffer, image_format, quality=IMAGE_QUALITY)
+            name = variant_name(image_field.name, width, extension)
+            if storage.exists(name):
+                storage.delete(name)
+            storage.save(name, ContentFile(buffer.getvalue()))
+
+
+def delete_variants(storage, name):
+    for width in IMAGE_WIDTHS:
+        for extension, _, _ in VARIANT_FORMATS:
+            variant = variant_name(name, width, extension)
+            if storage.exists(variant):
+                storage.delete(variant)
+
+
+def image_sources(image_field):
+    return [
+        {
+            'type': mime_type,
+            'srcset': ', '.join(
+                f'{variant_url(image_field, width, ext)} {width}w'
+                for width in IMAGE_WIDTHS
+            ),
+        }
+        for ext, _, mime_type in VARIANT_FORMATS
+    ]
+
+
+def mark_image_changed(post, previous=None):
+    """Готовит публикацию с новым изображением к сохранению.
+
+    Копии прежнего изображения previous удаляются после фиксации.
+    """
+    post.image_status = (
+        Post.ImageStatus.PENDING if post.image else Post.ImageStatus.MISSING
+    )
+    if previous:
+        storage, name = previous.storage, previous.name
+        transaction.on_commit(lambda: delete_variants(storage, name))
+
+
+def set_image_status(task, status):
+    """Меняет статус копий, только если изображение не успели заменить."""
+    updated = Post.objects.filter(
+        pk=task.post_id, image=task.image
+    ).update(image_status=status)
+    if updated:
+        invalidate(*post_scopes(task.post))
+    return updated
+
+
+def enqueue_variants(post):
+    return ImageTask.objects.create(post=post, image=post.image.name)
+
+
+def claim_task(stale_after=None):
+    """Забирает следующую задачу из очереди или возвращает None.
+
+    Задача захватывается условным UPDATE, поэтому несколько обработчиков
+    не возьмут одну и ту же задачу и без SELECT FOR UPDATE.
+    """
+    now = timezone.now()
+    if stale_after is not None:
+        ImageTask.objects.filter(
+            status=ImageTask.Status.RUNNING,
+            updated_at__lt=now - stale_after
+        ).update(status=ImageTask.Status.PENDING, updated_at=now)
+    candidates = ImageTask.objects.filter(
+        status=ImageTask.Status.PENDING, run_after__lte=now
+    ).values_list('pk', flat=True)[:10]
+    for pk in candidates:
+        claimed = ImageTask.objects.filter(
+            pk=pk, status=ImageTask.Status.PENDING
+        ).update(
+            status=ImageTask.Status.RUNNING,
+            attempts=F('attempts') + 1,
+            updated_at=now
+        )
+        if claimed:
+            return ImageTask.objects.select_related('post').get(pk=pk)
+    return None
+
+
+def process_task(task, max_attempts=MAX_ATTEMPTS):
+    post = task.post
+    if post.image.name != task.image:
+        # Изображение успели заменить: копии сделает более новая задача.
+        task.status = ImageTask.Status.DONE
+        task.save(update_fields=('status', 'updated_at'))
+        return task
+    try:
+        generate_variants(post.image)
+    except Exception as error:
+        task.last_error = f'{type(error).__name__}: {error}'
+        if task.attempts < max_attempts:
+            task.status = ImageTask.Status.PENDING
+            task.run_after = (
+                timezone.now() + RETRY_DELAY * 2 ** (task.attempts - 1)
+            )
+        else:
+            task.status = ImageTask.Status.FAILED
+            set_image_status(task, Post.ImageStatus.FAILED)
+    else:
+        task.status = ImageTask.Status.DONE
+        if not set_image_status(task, Post.ImageStatus.READY):
+            # Изображение заменили во время обработки: копии старого
+            # никому не нужны.
+            delete_variants(post.image.storage, task.image)
+    task.save(update_fields=('status', 'last_error', 'run_after',
+                             'updated_at'))
+    return task
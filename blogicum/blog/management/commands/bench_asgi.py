@@ -0,0 +1,260 @@
+import argparse
+import asyncio
+import os
+import socketserver
+import statistics
+import subprocess
+import sys
+import time
+from urllib.parse import unquote
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer, make_server
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+
+from blog.models import Post
+
+# Режим сервера и значение BLOGICUM_ASYNC_VIEWS для него.
+MODES = {
+    'wsgi': '0',
+    'asgi-sync': '0',
+    'asgi-async': '1',
+}
+HOST = '127.0.0.1'
+
+
+class ThreadingWSGIServer(socketserver.ThreadingMixIn, WSGIServer):
+    daemon_threads = True
+
+
+class QuietHandler(WSGIRequestHandler):
+
+    def log_message(self, *args):
+        pass
+
+
+def serve_wsgi(port):
+    from django.core.wsgi import get_wsgi_application
+
+    make_server(
+        HOST, port, get_wsgi_application(),
+        server_class=ThreadingWSGIServer, handler_class=QuietHandler
+    ).serve_forever()
+
+
+async def handle_asgi(application, port, reader, writer):
+    """Одно соединение HTTP/1.1 без keep-alive и тела запроса."""
+    method, target, _ = (await reader.readline()).decode().split(' ', 2)
+    headers = []
+    while (line := await reader.readline()) not in (b'\r\n', b''):
+        name, value = line.split(b':', 1)
+        headers.append((name.strip().lower(), value.strip()))
+    path, _, query = target.partition('?')
+    scope = {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': method,
+        'scheme': 'http',
+        'path': unquote(path),
+        'raw_path': path.encode(),
+        'query_string': query.encode(),
+        'root_path': '',
+        'headers': headers,
+        'client': writer.get_extra_info('peername')[:2],
+        'server': (HOST, port),
+    }
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        if message['type'] == 'http.response.start':
+            writer.write(f'HTTP/1.1 {message["status"]} \r\n'.encode())
+            for name, value in message.get('headers', ()):
+                writer.write(name + b': ' + value + b'\r\n')
+            writer.write(b'connection: close\r\n\r\n')
+        else:
+            writer.write(message.get('body', b''))
+        await writer.drain()
+
+    try:
+        await application(scope, receive, send)
+    finally:
+        writer.close()
+
+
+def serve_asgi(port):
+    from blogicum.asgi import application
+
+    async def main():
+        server = await asyncio.start_server(
+            lambda reader, writer: handle_asgi(
+                application, port, reader, writer
+            ),
+            HOST, port, backlog=1024
+        )
+        async with server:
+            await server.serve_forever()
+
+    asyncio.run(main())
+
+
+async def fetch(port, path):
+    reader, writer = await asyncio.open_connection(HOST, port)
+    writer.write(
+        f'GET {path} HTTP/1.1\r\nHost: {HOST}\r\n'
+        f'Connection: close\r\n\r\n'.encode()
+    )
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    return int(response.split(b' ', 2)[1])
+
+
+async def load(port, paths, requests, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    errors = 0
+
+    async def one(path):
+        nonlocal errors
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                status = await fetch(port, path)
+            except OSError:
+                status = None
+            latencies.append((time.perf_counter() - start) * 1000)
+            if status != 200:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        one(paths[index % len(paths)]) for index in range(requests)
+    ))
+    return latencies, errors, time.perf_counter() - start
+
+
+class Command(BaseCommand):
+    help = (
+        'Нагружает ленту, категорию, профиль и публикацию через WSGI, '
+        'ASGI с синхронными и ASGI с асинхронными представлениями и '
+        'сравнивает пропускную способность и задержки.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=2000,
+            help='Число запросов на каждый режим.'
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=64,
+            help='Число одновременных соединений.'
+        )
+        parser.add_argument(
+            '--port',
+            type=int,
+            default=8765,
+            help='Порт, на котором запускаются серверы.'
+        )
+        parser.add_argument(
+            '--mode',
+            choices=MODES,
+            action='append',
+            help='Замерить только этот режим; можно указать несколько раз.'
+        )
+        # Служебный режим: дочерний процесс с сервером.
+        parser.add_argument(
+            '--serve', choices=MODES, help=argparse.SUPPRESS
+        )
+
+    def get_paths(self):
+        post = Post.objects.filter(is_visible=True).select_related(
+            'category', 'author'
+        ).order_by('-comment_count').first()
+        if post is None:
+            raise CommandError('В базе нет опубликованных публикаций.')
+        return [
+            '/',
+            f'/category/{post.category.slug}/',
+            f'/profile/{post.author.username}/',
+            f'/posts/{post.pk}/',
+        ]
+
+    def serve(self, mode, port):
+        # Замеряется работа представлений, а не кэш страниц
+        # и не отладочные инструменты.
+        with override_settings(
+            DEBUG=False,
+            ALLOWED_HOSTS=[HOST],
+            MIDDLEWARE=[
+                name for name in settings.MIDDLEWARE
+                if not name.startswith('debug_toolbar.')
+            ],
+            FEED_CACHE_TIMEOUT=0
+        ):
+            self.stdout.write('ready')
+            self.stdout.flush()
+            if mode == 'wsgi':
+                serve_wsgi(port)
+            else:
+                serve_asgi(port)
+
+    def start_server(self, mode, port):
+        env = {**os.environ, 'BLOGICUM_ASYNC_VIEWS': MODES[mode]}
+        server = subprocess.Popen(
+            [
+                sys.executable, 'manage.py', 'bench_asgi',
+                '--serve', mode, '--port', str(port),
+            ],
+            cwd=settings.BASE_DIR,
+            env=env,
+            stdout=subprocess.PIPE,
+            text=True
+        )
+        server.stdout.readline()
+        # Сервер начинает слушать порт чуть позже сообщения о готовности.
+        deadline = time.monotonic() + 10
+        while True:
+            try:
+                asyncio.run(fetch(port, '/'))
+                return server
+            except OSError:
+                if time.monotonic() > deadline:
+                    server.terminate()
+                    raise CommandError(f'Сервер {mode} не запустился.')
+                time.sleep(0.1)
+
+    def report(self, mode, latencies, errors, elapsed):
+        percentiles = statistics.quantiles(latencies, n=100)
+        self.stdout.write(
+            f'{mode:>10}: {len(latencies) / elapsed:7.0f} запросов/с, '
+            f'p50 {percentiles[49]:6.1f} мс, '
+            f'p95 {percentiles[94]:6.1f} мс, '
+            f'p99 {percentiles[98]:6.1f} мс, '
+            f'ошибок {errors}'
+        )
+
+    def handle(self, *args, requests, concurrency, port, mode, serve,
+               **options):
+        if serve:
+            self.serve(serve, port)
+            return
+        paths = self.get_paths()
+        for name in mode or MODES:
+            server = self.start_server(name, port)
+            try:
+                # Прогрев: соединения, шаблоны и кэш запросов.
+                asyncio.run(load(port, paths, len(paths) * 5, concurrency))
+                self.report(name, *asyncio.run(
+                    load(port, paths, requests, concurrency)
+                ))
+            finally:
+                server.terminate()
+                server.wait()
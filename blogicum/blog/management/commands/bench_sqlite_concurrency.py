@@ -0,0 +1,141 @@
+import random
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connection, connections
+from django.test.utils import override_settings
+
+from blog.models import Comment, FeedEntry, Post, User
+from blog.views import FEED_ORDERING, NUMBER_OF_POSTS
+
+# Настройки SQLite по умолчанию, с которыми сравниваются SQLITE_PRAGMAS.
+DEFAULT_PRAGMAS = {
+    'journal_mode': 'delete',
+    'synchronous': 'full',
+    'busy_timeout': 0,
+}
+BENCH_TEXT = 'Комментарий из bench_sqlite_concurrency'
+
+
+class Command(BaseCommand):
+    help = (
+        'Нагружает SQLite параллельной записью комментариев и чтением '
+        'ленты и показывает пропускную способность и долю ошибок '
+        '«database is locked».'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--writers',
+            type=int,
+            default=8,
+            help='Число потоков, пишущих комментарии.'
+        )
+        parser.add_argument(
+            '--readers',
+            type=int,
+            default=4,
+            help='Число потоков, листающих ленту.'
+        )
+        parser.add_argument(
+            '--duration',
+            type=float,
+            default=5,
+            help='Длительность каждого прогона, секунды.'
+        )
+        parser.add_argument(
+            '--baseline',
+            action='store_true',
+            help='Сначала прогнать с настройками SQLite по умолчанию.'
+        )
+
+    def write(self, post_ids, user_ids):
+        Comment.objects.create(
+            post_id=random.choice(post_ids),
+            author_id=random.choice(user_ids),
+            text=BENCH_TEXT
+        )
+
+    def read(self, pages):
+        offset = random.randrange(pages) * NUMBER_OF_POSTS
+        entries = FeedEntry.objects.order_by(*FEED_ORDERING).values_list(
+            'post_id', flat=True
+        )[offset:offset + NUMBER_OF_POSTS]
+        list(Post.objects.filter(pk__in=list(entries)))
+
+    def run(self, pragmas, writers, readers, duration):
+        post_ids = list(FeedEntry.objects.values_list('post_id', flat=True))
+        user_ids = list(User.objects.values_list('pk', flat=True))
+        pages = max(len(post_ids) // NUMBER_OF_POSTS, 1)
+        stats = Counter()
+        lock = threading.Lock()
+        deadline = time.monotonic() + duration
+
+        def worker(role, operation):
+            try:
+                while time.monotonic() < deadline:
+                    try:
+                        operation()
+                        outcome = 'ok'
+                    except OperationalError as error:
+                        if 'locked' not in str(error):
+                            raise
+                        outcome = 'locked'
+                    with lock:
+                        stats[role, outcome] += 1
+            finally:
+                connections.close_all()
+
+        # Соединения открываются заново и получают новые PRAGMA.
+        connections.close_all()
+        with override_settings(SQLITE_PRAGMAS=pragmas):
+            threads = [
+                threading.Thread(
+                    target=worker,
+                    args=('запись', lambda: self.write(post_ids, user_ids))
+                )
+                for _ in range(writers)
+            ] + [
+                threading.Thread(
+                    target=worker, args=('чтение', lambda: self.read(pages))
+                )
+                for _ in range(readers)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        connections.close_all()
+        return stats
+
+    def report(self, title, stats, duration):
+        self.stdout.write(self.style.MIGRATE_HEADING(title))
+        for role in ('запись', 'чтение'):
+            ok = stats[role, 'ok']
+            locked = stats[role, 'locked']
+            total = ok + locked
+            self.stdout.write(
+                f'{role}: {ok / duration:.0f} операций/с, '
+                f'ошибок блокировки {locked} '
+                f'({locked / total if total else 0:.1%})'
+            )
+
+    def handle(self, *args, writers, readers, duration, baseline,
+               **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError('Команда измеряет только SQLite.')
+        if not FeedEntry.objects.exists() or not User.objects.exists():
+            raise CommandError('В базе нет опубликованных публикаций.')
+        runs = [('Настройки SQLITE_PRAGMAS', settings.SQLITE_PRAGMAS)]
+        if baseline:
+            runs.insert(0, ('Настройки SQLite по умолчанию', DEFAULT_PRAGMAS))
+        try:
+            for title, pragmas in runs:
+                stats = self.run(pragmas, writers, readers, duration)
+                self.report(title, stats, duration)
+        finally:
+            deleted, _ = Comment.objects.filter(text=BENCH_TEXT).delete()
+            self.stdout.write(f'Удалено тестовых комментариев: {deleted}.')
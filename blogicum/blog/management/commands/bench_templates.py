@@ -0,0 +1,104 @@
+import time
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand
+from django.core.paginator import Paginator
+from django.template.backends.django import DjangoTemplates
+from django.test import RequestFactory
+
+from blog.forms import CommentForm
+from blog.models import Post
+from blog.paginators import KeysetPaginator
+from blog.views import (
+    COMMENTS_ORDERING,
+    NUMBER_OF_COMMENTS,
+    NUMBER_OF_POSTS,
+    output_published
+)
+
+LOADERS = {
+    'обычный': [
+        'django.template.loaders.filesystem.Loader',
+        'django.template.loaders.app_directories.Loader',
+    ],
+    'кэширующий': [
+        ('django.template.loaders.cached.Loader', [
+            'django.template.loaders.filesystem.Loader',
+            'django.template.loaders.app_directories.Loader',
+        ]),
+    ],
+}
+
+
+def make_backend(loaders):
+    config = settings.TEMPLATES[0]
+    return DjangoTemplates({
+        'NAME': 'bench',
+        'DIRS': config['DIRS'],
+        'APP_DIRS': False,
+        'OPTIONS': {**config['OPTIONS'], 'loaders': loaders},
+    })
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает скорость отрисовки index.html и detail.html '
+        'с обычным и кэширующим загрузчиком шаблонов.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=200,
+            help='Сколько раз отрисовать каждый шаблон.'
+        )
+
+    def get_contexts(self):
+        posts = list(output_published(
+            Post.objects.all(), skip_filter=False
+        )[:NUMBER_OF_POSTS])
+        if not posts:
+            return {}
+        post = posts[0]
+        return {
+            'blog/index.html': {
+                'page_obj': Paginator(posts, NUMBER_OF_POSTS).page(1),
+            },
+            'blog/detail.html': {
+                'post': post,
+                'form': CommentForm(),
+                'comments': KeysetPaginator(
+                    post.comments.select_related('author'),
+                    NUMBER_OF_COMMENTS,
+                    COMMENTS_ORDERING
+                ).page(),
+            },
+        }
+
+    def handle(self, *args, repeat, **options):
+        contexts = self.get_contexts()
+        if not contexts:
+            self.stdout.write('В базе нет опубликованных публикаций.')
+            return
+        request = RequestFactory().get('/')
+        request.user = AnonymousUser()
+        for name, context in contexts.items():
+            rates = {}
+            for label, loaders in LOADERS.items():
+                backend = make_backend(loaders)
+                # Как и представление, шаблон запрашивается на каждую
+                # отрисовку: именно это и экономит кэширующий загрузчик.
+                start = time.perf_counter()
+                for _ in range(repeat):
+                    backend.get_template(name).render(context, request)
+                rates[label] = repeat / (time.perf_counter() - start)
+                self.stdout.write(
+                    f'{name}, {label} загрузчик: '
+                    f'{rates[label]:.0f} отрисовок/с'
+                )
+            self.stdout.write(self.style.SUCCESS(
+                f'{name}: ускорение в '
+                f'{rates["кэширующий"] / rates["обычный"]:.1f} раза'
+            ))
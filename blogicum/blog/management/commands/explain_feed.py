@@ -0,0 +1,87 @@
+import re
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from blog.models import Comment, FeedEntry, Post
+from blog.search import search_results, search_terms
+from blog.views import (
+    COMMENTS_ORDERING,
+    FEED_ORDERING,
+    NUMBER_OF_POSTS,
+    output_published
+)
+
+# Проход по индексу в порядке сортировки ленты полным просмотром не считается.
+FULL_SCAN = re.compile(
+    r'\bSCAN (TABLE )?blog_(post|comment|feedentry)\b'
+    r'(?! USING (COVERING )?INDEX)|Seq Scan'
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Показывает планы и время запросов лент и поиска: полный просмотр '
+        'таблиц публикаций и комментариев считается ошибкой.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=20,
+            help='Сколько раз выполнить каждый запрос для замера времени.'
+        )
+        parser.add_argument(
+            '--search',
+            help='Поисковый запрос; по умолчанию первое слово заголовка '
+                 'самой обсуждаемой публикации.'
+        )
+
+    def get_queries(self, search=None):
+        post = Post.objects.order_by('-comment_count').first()
+        if post is None:
+            return {}
+        results, ordering = search_results(
+            search or next(iter(search_terms(post.title)), '')
+        )
+        return {
+            'feed': FeedEntry.objects.order_by(*FEED_ORDERING),
+            'category': FeedEntry.objects.filter(
+                category_id=post.category_id
+            ).order_by(*FEED_ORDERING),
+            'author': output_published(
+                Post.objects.filter(author_id=post.author_id)
+            ),
+            'comments': Comment.objects.filter(
+                post_id=post.id
+            ).order_by(*COMMENTS_ORDERING),
+            'search': results.order_by(*ordering),
+        }
+
+    def handle(self, *args, repeat, search, **options):
+        queries = self.get_queries(search)
+        if not queries:
+            self.stdout.write('В базе нет публикаций.')
+            return
+        scans = []
+        for name, queryset in queries.items():
+            queryset = queryset[:NUMBER_OF_POSTS]
+            plan = queryset.explain()
+            start = time.perf_counter()
+            for _ in range(repeat):
+                list(queryset.all())
+            elapsed = (time.perf_counter() - start) / repeat * 1000
+            self.stdout.write(self.style.MIGRATE_HEADING(
+                f'{name}: {elapsed:.2f} мс'
+            ))
+            self.stdout.write(plan)
+            if FULL_SCAN.search(plan):
+                scans.append(name)
+        if scans:
+            raise CommandError(
+                f'Полный просмотр таблицы: {", ".join(scans)}.'
+            )
+        self.stdout.write(
+            self.style.SUCCESS('Все запросы используют индексы.')
+        )
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from blog.cache import get_stats, reset_stats
+
+
+class Command(BaseCommand):
+    help = 'Показывает долю попаданий в кэш страниц лент.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--reset',
+            action='store_true',
+            help='Обнулить счётчики после вывода.'
+        )
+
+    def handle(self, *args, reset, **options):
+        stats = get_stats()
+        self.stdout.write(
+            f'Попаданий: {stats["hits"]}, промахов: {stats["misses"]}, '
+            f'доля попаданий: {stats["hit_rate"]:.1%}'
+        )
+        if reset:
+            reset_stats()
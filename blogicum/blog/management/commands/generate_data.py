@@ -0,0 +1,244 @@
+import random
+import time
+from array import array
+from datetime import datetime, timedelta
+from itertools import accumulate
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import Max
+from django.utils import timezone
+
+from blog.bulkload import bulk_loading, rebuild_derived_data
+from blog.models import Category, Comment, Location, Post, User
+
+WORDS = (
+    'утро', 'вечер', 'город', 'дорога', 'река', 'лес', 'море', 'дом',
+    'друг', 'книга', 'обед', 'поезд', 'письмо', 'сад', 'зима', 'лето',
+    'осень', 'весна', 'небо', 'снег', 'дождь', 'солнце', 'ветер', 'мост',
+    'театр', 'музей', 'площадь', 'улица', 'кофе', 'чай', 'работа',
+    'прогулка', 'встреча', 'разговор', 'новость', 'история', 'картина',
+    'музыка', 'праздник', 'путешествие', 'вокзал', 'гора', 'остров',
+    'берег', 'окно', 'дверь', 'свет', 'тишина', 'шум', 'ночь', 'день',
+    'неделя', 'месяц', 'год', 'выставка', 'концерт', 'рынок', 'парк',
+    'библиотека', 'кафе', 'школа', 'сосед', 'кошка', 'собака',
+)
+# Из этих предложений собираются тексты: так быстрее, чем писать
+# каждый текст по словам.
+SENTENCES = 2000
+FUTURE_SHARE = 0.02
+UNPUBLISHED_SHARE = 0.05
+NO_LOCATION_SHARE = 0.3
+HIDDEN_GROUP_SHARE = 0.1
+# Средняя задержка комментария после публикации, секунды.
+COMMENT_DELAY = 2 * 24 * 60 * 60
+
+
+def zipf_weights(count, exponent=1.0):
+    """Накопленные веса: немногим элементам достаётся большая часть."""
+    return list(accumulate(1 / (rank + 1) ** exponent
+                           for rank in range(count)))
+
+
+def next_pk(model):
+    return (model.objects.aggregate(Max('pk'))['pk__max'] or 0) + 1
+
+
+class Command(BaseCommand):
+    help = (
+        'Наполняет базу синтетическими пользователями, категориями, '
+        'местоположениями, публикациями и комментариями для нагрузочных '
+        'тестов: авторы, категории и обсуждаемые публикации выбираются '
+        'с перекосом, часть публикаций скрыта или отложена.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000,
+                            help='Количество пользователей.')
+        parser.add_argument('--categories', type=int, default=20,
+                            help='Количество категорий.')
+        parser.add_argument('--locations', type=int, default=200,
+                            help='Количество местоположений.')
+        parser.add_argument('--posts', type=int, default=100000,
+                            help='Количество публикаций.')
+        parser.add_argument('--comments', type=int, default=300000,
+                            help='Количество комментариев.')
+        parser.add_argument('--days', type=int, default=730,
+                            help='За сколько дней распределить публикации.')
+        parser.add_argument('--batch-size', type=int, default=5000,
+                            help='Количество объектов в одной пачке.')
+        parser.add_argument('--seed', type=int, default=1,
+                            help='Зерно генератора случайных чисел.')
+
+    def words(self, low, high):
+        return ' '.join(self.random.choices(
+            WORDS, k=self.random.randint(low, high)
+        ))
+
+    def moment(self):
+        return self.now - timedelta(seconds=self.random.random() * self.span)
+
+    def create_users(self, loader, count):
+        first = next_pk(User)
+        # Хэш пароля дорогой: один непригодный для входа на всех.
+        password = make_password(None)
+        for pk in range(first, first + count):
+            loader.add(User(
+                pk=pk,
+                username=f'user_{pk}',
+                first_name=self.words(1, 1).capitalize(),
+                password=password,
+                date_joined=self.moment()
+            ))
+        return list(range(first, first + count))
+
+    def create_categories(self, loader, count):
+        first = next_pk(Category)
+        for pk in range(first, first + count):
+            loader.add(Category(
+                pk=pk,
+                title=self.words(1, 3).capitalize(),
+                description=self.random.choice(self.sentences),
+                slug=f'category-{pk}',
+                is_published=self.random.random() >= HIDDEN_GROUP_SHARE,
+                created_at=self.moment()
+            ))
+        return list(range(first, first + count))
+
+    def create_locations(self, loader, count):
+        first = next_pk(Location)
+        for pk in range(first, first + count):
+            loader.add(Location(
+                pk=pk,
+                name=self.words(1, 2).capitalize(),
+                is_published=self.random.random() >= HIDDEN_GROUP_SHARE,
+                created_at=self.moment()
+            ))
+        return list(range(first, first + count))
+
+    def create_posts(self, loader, count, users, categories, locations,
+                     batch_size):
+        rnd = self.random
+        first = next_pk(Post)
+        author_weights = zipf_weights(len(users))
+        category_weights = zipf_weights(len(categories), 0.7)
+        location_weights = zipf_weights(len(locations))
+        pub_times = array('d')
+        for start in range(0, count, batch_size):
+            size = min(batch_size, count - start)
+            authors = rnd.choices(users, cum_weights=author_weights, k=size)
+            post_categories = rnd.choices(
+                categories, cum_weights=category_weights, k=size
+            )
+            post_locations = rnd.choices(
+                locations, cum_weights=location_weights, k=size
+            ) if locations else [None] * size
+            for index in range(size):
+                if rnd.random() < FUTURE_SHARE:
+                    pub_date = self.now + timedelta(days=rnd.random() * 7)
+                else:
+                    pub_date = self.moment()
+                created_at = min(pub_date, self.now) - timedelta(
+                    minutes=rnd.random() * 60 * 24
+                )
+                location = post_locations[index]
+                if rnd.random() < NO_LOCATION_SHARE:
+                    location = None
+                loader.add(Post(
+                    pk=first + start + index,
+                    title=self.words(2, 6).capitalize(),
+                    text=' '.join(rnd.choices(
+                        self.sentences,
+                        k=max(1, round(rnd.lognormvariate(1.5, 0.7)))
+                    )),
+                    pub_date=pub_date,
+                    author_id=authors[index],
+                    category_id=post_categories[index],
+                    location_id=location,
+                    is_published=rnd.random() >= UNPUBLISHED_SHARE,
+                    created_at=created_at,
+                    updated_at=created_at
+                ))
+                pub_times.append(pub_date.timestamp())
+        return first, pub_times
+
+    def create_comments(self, loader, count, users, first_post, pub_times,
+                        batch_size):
+        rnd = self.random
+        now = self.now.timestamp()
+        # Популярность публикаций не зависит от их ключа; отложенные
+        # публикации обсуждать ещё рано.
+        order = list(range(len(pub_times)))
+        rnd.shuffle(order)
+        weights = [0.0] * len(pub_times)
+        for rank, index in enumerate(order):
+            if pub_times[index] <= now:
+                weights[index] = 1 / (rank + 1) ** 1.1
+        post_weights = list(accumulate(weights))
+        if not post_weights or not post_weights[-1]:
+            return
+        author_weights = zipf_weights(len(users))
+        timezone_info = self.now.tzinfo
+        for start in range(0, count, batch_size):
+            size = min(batch_size, count - start)
+            posts = rnd.choices(
+                range(len(pub_times)), cum_weights=post_weights, k=size
+            )
+            authors = rnd.choices(users, cum_weights=author_weights, k=size)
+            for index in range(size):
+                post = posts[index]
+                created_at = min(
+                    now,
+                    pub_times[post] + rnd.expovariate(1 / COMMENT_DELAY)
+                )
+                loader.add(Comment(
+                    post_id=first_post + post,
+                    author_id=authors[index],
+                    text=' '.join(rnd.choices(
+                        self.sentences, k=rnd.randint(1, 3)
+                    )),
+                    created_at=datetime.fromtimestamp(
+                        created_at, timezone_info
+                    )
+                ))
+
+    def handle(self, *args, users, categories, locations, posts, comments,
+               days, batch_size, seed, **options):
+        if posts and not (users and categories):
+            raise CommandError(
+                'Для публикаций нужны пользователи и категории.'
+            )
+        if comments and not (posts and users):
+            raise CommandError(
+                'Для комментариев нужны публикации и пользователи.'
+            )
+        start = time.perf_counter()
+        self.random = random.Random(seed)
+        self.now = timezone.now()
+        self.span = days * 24 * 60 * 60
+        self.sentences = [
+            self.words(4, 14).capitalize() + '.' for _ in range(SENTENCES)
+        ]
+        with bulk_loading(DEFAULT_DB_ALIAS, batch_size) as loader:
+            user_ids = self.create_users(loader, users)
+            category_ids = self.create_categories(loader, categories)
+            location_ids = self.create_locations(loader, locations)
+            first_post, pub_times = self.create_posts(
+                loader, posts, user_ids, category_ids, location_ids,
+                batch_size
+            )
+            self.create_comments(
+                loader, comments, user_ids, first_post, pub_times,
+                batch_size
+            )
+        self.stdout.write(
+            f'Записано за {time.perf_counter() - start:.1f} с.'
+        )
+        rebuild_derived_data(batch_size, self.stdout)
+        self.stdout.write(self.style.SUCCESS(
+            f'Создано: пользователей {users}, категорий {categories}, '
+            f'местоположений {locations}, публикаций {posts}, '
+            f'комментариев {comments} '
+            f'за {time.perf_counter() - start:.1f} с.'
+        ))
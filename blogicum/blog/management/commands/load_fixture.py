@@ -0,0 +1,63 @@
+import gzip
+import time
+
+from django.core import serializers
+from django.core.serializers.base import DeserializationError
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+
+from blog.bulkload import bulk_loading, iter_json_array, rebuild_derived_data
+
+
+def open_fixture(path):
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rt', encoding='utf-8')
+    return open(path, encoding='utf-8')
+
+
+class Command(BaseCommand):
+    help = (
+        'Быстро загружает JSON-фикстуры: читает их потоком и пишет '
+        'пачками через bulk_create в одной транзакции, проверяя внешние '
+        'ключи в конце. Затем пересчитывает ленту и счётчики комментариев.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'fixtures',
+            nargs='+',
+            help='Пути к фикстурам в формате JSON (можно .json.gz).'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Количество объектов одной модели в одном INSERT.'
+        )
+
+    def handle(self, *args, fixtures, batch_size, **options):
+        start = time.perf_counter()
+        try:
+            with bulk_loading(DEFAULT_DB_ALIAS, batch_size) as loader:
+                for path in fixtures:
+                    with open_fixture(path) as stream:
+                        objects = serializers.deserialize(
+                            'python',
+                            iter_json_array(stream),
+                            using=DEFAULT_DB_ALIAS,
+                            ignorenonexistent=True
+                        )
+                        for deserialized in objects:
+                            loader.add(deserialized.object)
+                            loader.add_m2m(
+                                deserialized.object, deserialized.m2m_data
+                            )
+        except (OSError, ValueError, DeserializationError) as error:
+            raise CommandError(f'Не удалось загрузить фикстуру: {error}')
+        for label, count in sorted(loader.counts.items()):
+            self.stdout.write(f'{label}: {count}')
+        rebuild_derived_data(batch_size, self.stdout)
+        self.stdout.write(self.style.SUCCESS(
+            f'Загружено объектов: {sum(loader.counts.values())} '
+            f'за {time.perf_counter() - start:.1f} с.'
+        ))
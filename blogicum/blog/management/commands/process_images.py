@@ -0,0 +1,84 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from blog.images import (
+    MAX_ATTEMPTS,
+    claim_task,
+    enqueue_variants,
+    process_task
+)
+from blog.models import ImageTask, Post
+
+
+class Command(BaseCommand):
+    help = (
+        'Обработчик очереди изображений: создаёт уменьшенные копии '
+        'вне запросов пользователей и повторяет неудачные попытки.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Обработать текущую очередь и выйти.'
+        )
+        parser.add_argument(
+            '--sleep',
+            type=float,
+            default=2,
+            help='Пауза между опросами пустой очереди, секунды.'
+        )
+        parser.add_argument(
+            '--max-attempts',
+            type=int,
+            default=MAX_ATTEMPTS,
+            help='После стольких неудач задача помечается ошибочной.'
+        )
+        parser.add_argument(
+            '--stale-after',
+            type=int,
+            default=600,
+            help='Вернуть в очередь задачи, зависшие дольше, секунды.'
+        )
+        parser.add_argument(
+            '--backfill',
+            action='store_true',
+            help='Поставить в очередь изображения без готовых копий.'
+        )
+
+    def backfill(self):
+        posts = Post.objects.exclude(image='').filter(
+            image_status=Post.ImageStatus.MISSING
+        ).exclude(
+            image_tasks__status__in=(
+                ImageTask.Status.PENDING, ImageTask.Status.RUNNING
+            )
+        )
+        pks = []
+        for post in posts.iterator():
+            enqueue_variants(post)
+            pks.append(post.pk)
+        Post.objects.filter(pk__in=pks).update(
+            image_status=Post.ImageStatus.PENDING
+        )
+        self.stdout.write(f'Поставлено в очередь: {len(pks)}.')
+
+    def handle(self, *args, once, sleep, max_attempts, stale_after,
+               backfill, **options):
+        if backfill:
+            self.backfill()
+        stale_after = timedelta(seconds=stale_after)
+        while True:
+            task = claim_task(stale_after)
+            if task is None:
+                if once:
+                    return
+                time.sleep(sleep)
+                continue
+            task = process_task(task, max_attempts)
+            self.stdout.write(
+                f'{task.image}: {task.get_status_display()}'
+                + (f' ({task.last_error})' if task.last_error else '')
+            )
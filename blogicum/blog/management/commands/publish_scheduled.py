@@ -0,0 +1,44 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from blog.publishing import next_publication_date, publish_due_posts
+
+
+class Command(BaseCommand):
+    help = (
+        'Планировщик отложенных публикаций: показывает публикации '
+        'в лентах, когда наступает их время, и сбрасывает кэш лент.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Опубликовать наступившие публикации и выйти.'
+        )
+        parser.add_argument(
+            '--sleep',
+            type=float,
+            default=30,
+            help='Наибольшая пауза между проверками, секунды.'
+        )
+
+    def handle(self, *args, once, sleep, **options):
+        while True:
+            published = publish_due_posts()
+            if published:
+                self.stdout.write(f'Опубликовано: {len(published)}.')
+            if once:
+                return
+            # Спим до ближайшей отложенной публикации, но не дольше sleep:
+            # новые публикации могут появиться в любой момент.
+            next_date = next_publication_date()
+            delay = sleep
+            if next_date is not None:
+                delay = min(
+                    sleep,
+                    max((next_date - timezone.now()).total_seconds(), 0)
+                )
+            time.sleep(delay)
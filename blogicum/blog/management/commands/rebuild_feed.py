@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from blog.models import Post
+from blog.publishing import rebuild_feed_entries, refresh_visibility
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересчитывает видимость публикаций и таблицу ленты пакетами '
+        'по первичному ключу, например, после массовой загрузки данных.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Количество публикаций в одном пакете.'
+        )
+
+    def handle(self, *args, batch_size, **options):
+        last_pk = 0
+        checked = visible = 0
+        while True:
+            pks = list(
+                Post.objects.filter(pk__gt=last_pk)
+                .order_by('pk')
+                .values_list('pk', flat=True)[:batch_size]
+            )
+            if not pks:
+                break
+            posts = Post.objects.filter(pk__in=pks)
+            with transaction.atomic():
+                refresh_visibility(posts)
+                visible += rebuild_feed_entries(posts, batch_size)
+            checked += len(pks)
+            last_pk = pks[-1]
+        self.stdout.write(self.style.SUCCESS(
+            f'Проверено публикаций: {checked}, в ленте: {visible}.'
+        ))
@@ -0,0 +1,50 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from blog.models import Comment, Post
+
+
+def actual_comment_count():
+    return Coalesce(
+        Subquery(
+            Comment.objects.filter(post=OuterRef('pk'))
+            .order_by()
+            .values('post')
+            .annotate(total=Count('pk'))
+            .values('total')
+        ),
+        0
+    )
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает Post.comment_count пакетами по первичному ключу.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Количество публикаций в одном UPDATE.'
+        )
+
+    def handle(self, *args, batch_size, **options):
+        last_pk = 0
+        checked = repaired = 0
+        while True:
+            pks = list(
+                Post.objects.filter(pk__gt=last_pk)
+                .order_by('pk')
+                .values_list('pk', flat=True)[:batch_size]
+            )
+            if not pks:
+                break
+            repaired += Post.objects.filter(pk__in=pks).exclude(
+                comment_count=actual_comment_count()
+            ).update(comment_count=actual_comment_count())
+            checked += len(pks)
+            last_pk = pks[-1]
+        self.stdout.write(self.style.SUCCESS(
+            f'Проверено публикаций: {checked}, исправлено: {repaired}.'
+        ))
@@ -0,0 +1,41 @@
+import sqlite3
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+
+class Command(BaseCommand):
+    help = (
+        'Копирует основную базу SQLite в файлы реплик через backup API; '
+        'для локальной проверки чтения из реплик.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'replicas',
+            nargs='*',
+            help='Псевдонимы реплик; по умолчанию все из DATABASE_REPLICAS.'
+        )
+
+    def handle(self, *args, replicas, **options):
+        replicas = replicas or settings.DATABASE_REPLICAS
+        if not replicas:
+            raise CommandError('Реплики не настроены: задайте DB_REPLICAS.')
+        primary = connections['default']
+        if primary.vendor != 'sqlite':
+            raise CommandError(
+                'Команда копирует только SQLite; для других СУБД '
+                'используйте их репликацию.'
+            )
+        primary.ensure_connection()
+        for alias in replicas:
+            if alias not in settings.DATABASE_REPLICAS:
+                raise CommandError(f'{alias} — не реплика.')
+            connections[alias].close()
+            target = sqlite3.connect(settings.DATABASES[alias]['NAME'])
+            try:
+                primary.connection.backup(target)
+            finally:
+                target.close()
+            self.stdout.write(self.style.SUCCESS(f'{alias} обновлена.'))
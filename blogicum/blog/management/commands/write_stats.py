@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from blog.cache import get_write_stats, reset_write_stats
+
+
+class Command(BaseCommand):
+    help = (
+        'Показывает число записей, отклонённых ограничением частоты, '
+        'и комментариев, записанных пачками.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--reset',
+            action='store_true',
+            help='Обнулить счётчики после вывода.'
+        )
+
+    def handle(self, *args, reset, **options):
+        stats = get_write_stats()
+        self.stdout.write(
+            f'Отклонено записей: {stats["rate_limited"]}, '
+            f'записано пачками комментариев: {stats["coalesced"]}, '
+            f'пачек: {stats["batches"]}, '
+            f'средний размер пачки: {stats["batch_size"]:.1f}'
+        )
+        if reset:
+            reset_write_stats()
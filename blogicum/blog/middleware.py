@@ -0,0 +1,20 @@
+from django.conf import settings
+from django.utils.deprecation import MiddlewareMixin
+
+from .routers import pin_to_primary
+
+SAFE_METHODS = frozenset(('GET', 'HEAD', 'OPTIONS'))
+
+
+class PrimaryStickinessMiddleware(MiddlewareMixin):
+    """После записи сессия какое-то время читает из основной базы.
+
+    Иначе пользователь мог бы не увидеть только что добавленный
+    комментарий, пока реплика не догнала основную базу. MiddlewareMixin
+    делает промежуточный слой пригодным и для асинхронной цепочки ASGI.
+    """
+
+    def process_response(self, request, response):
+        if settings.DATABASE_REPLICAS and request.method not in SAFE_METHODS:
+            pin_to_primary(request)
+        return response
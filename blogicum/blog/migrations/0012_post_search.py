@@ -0,0 +1,93 @@
+# Generated by Django 3.2.16 on 2026-10-17 06:42
+
+import blog.models
+from django.db import migrations, models
+import django.db.models.deletion
+
+SQLITE_FORWARD = (
+    """
+    CREATE VIRTUAL TABLE blog_post_fts USING fts5(
+        title, text,
+        content='blog_post', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER blog_post_fts_insert AFTER INSERT ON blog_post BEGIN
+        INSERT INTO blog_post_fts (rowid, title, text)
+        VALUES (new.id, new.title, new.text);
+    END
+    """,
+    """
+    CREATE TRIGGER blog_post_fts_delete AFTER DELETE ON blog_post BEGIN
+        INSERT INTO blog_post_fts (blog_post_fts, rowid, title, text)
+        VALUES ('delete', old.id, old.title, old.text);
+    END
+    """,
+    """
+    CREATE TRIGGER blog_post_fts_update
+    AFTER UPDATE OF title, text ON blog_post BEGIN
+        INSERT INTO blog_post_fts (blog_post_fts, rowid, title, text)
+        VALUES ('delete', old.id, old.title, old.text);
+        INSERT INTO blog_post_fts (rowid, title, text)
+        VALUES (new.id, new.title, new.text);
+    END
+    """,
+    "INSERT INTO blog_post_fts (blog_post_fts) VALUES ('rebuild')",
+)
+SQLITE_BACKWARD = (
+    'DROP TRIGGER IF EXISTS blog_post_fts_insert',
+    'DROP TRIGGER IF EXISTS blog_post_fts_delete',
+    'DROP TRIGGER IF EXISTS blog_post_fts_update',
+    'DROP TABLE IF EXISTS blog_post_fts',
+)
+POSTGRES_FORWARD = (
+    """
+    CREATE INDEX blog_post_search_idx ON blog_post USING gin (
+        to_tsvector('russian', coalesce("blog_post"."title", '')
+        || ' ' || coalesce("blog_post"."text", ''))
+    )
+    """,
+)
+POSTGRES_BACKWARD = ('DROP INDEX IF EXISTS blog_post_search_idx',)
+
+
+def run_for_vendor(statements):
+    def run(apps, schema_editor):
+        for sql in statements.get(schema_editor.connection.vendor, ()):
+            schema_editor.execute(sql, params=None)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0011_image_tasks'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostSearchIndex',
+            fields=[
+                ('post', models.OneToOneField(db_column='rowid', on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='search_index', serialize=False, to='blog.post')),
+                ('title', models.CharField(max_length=256, verbose_name='Заголовок')),
+                ('text', models.TextField(verbose_name='Текст')),
+                ('document', blog.models.SearchDocumentField(db_column='blog_post_fts')),
+                ('rank', models.FloatField()),
+            ],
+            options={
+                'db_table': 'blog_post_fts',
+                'managed': False,
+            },
+        ),
+        migrations.RunPython(
+            run_for_vendor({
+                'sqlite': SQLITE_FORWARD,
+                'postgresql': POSTGRES_FORWARD,
+            }),
+            run_for_vendor({
+                'sqlite': SQLITE_BACKWARD,
+                'postgresql': POSTGRES_BACKWARD,
+            }),
+        ),
+    ]
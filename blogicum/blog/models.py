@@ -1,9 +1,28 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
 from django.contrib.auth import get_user_model
 from django.db import models
 from django.urls import reverse
+from django.utils import timezone
 
 User = get_user_model()
 
+# Публикации, удаляемые прямо сейчас: их комментарии удаляются каскадом,
+# и поддерживать счётчик и кэш для каждого из них незачем.
+deleting_post_ids = ContextVar('deleting_post_ids', default=frozenset())
+
+
+@contextmanager
+def deleting_posts(pks):
+    # Набор живёт ровно столько, сколько удаление: при ошибке или откате
+    # он не останется в контексте потока.
+    token = deleting_post_ids.set(deleting_post_ids.get() | set(pks))
+    try:
+        yield
+    finally:
+        deleting_post_ids.reset(token)
+
 
 class PublishCreateModel(models.Model):
     is_published = models.BooleanField(
@@ -58,7 +77,23 @@ class Location(PublishCreateModel):
         return f'{self.name[:10]} {super().__str__()}'
 
 
+class PostQuerySet(models.QuerySet):
+
+    def delete(self):
+        with deleting_posts(self.values_list('pk', flat=True)):
+            return super().delete()
+
+
 class Post(PublishCreateModel):
+
+    class ImageStatus(models.TextChoices):
+        MISSING = '', 'Нет копий'
+        PENDING = 'pending', 'В очереди'
+        READY = 'ready', 'Готовы'
+        FAILED = 'failed', 'Ошибка'
+
+    objects = PostQuerySet.as_manager()
+
     title = models.CharField('Заголовок', max_length=256)
     text = models.TextField('Текст')
     pub_date = models.DateTimeField(
@@ -90,11 +125,53 @@ class Post(PublishCreateModel):
         related_name='posts'
     )
     image = models.ImageField('Фото', upload_to='posts_images', blank=True)
+    image_status = models.CharField(
+        'Копии изображения',
+        max_length=16,
+        choices=ImageStatus.choices,
+        default=ImageStatus.MISSING,
+        blank=True,
+        editable=False
+    )
+    comment_count = models.PositiveIntegerField(
+        'Количество комментариев',
+        default=0,
+        editable=False
+    )
+    updated_at = models.DateTimeField('Изменено', auto_now=True)
+    # Опубликована, категория опубликована и время публикации наступило.
+    # Отложенные публикации показывает команда publish_scheduled.
+    is_visible = models.BooleanField(
+        'Видна в лентах',
+        default=False,
+        editable=False
+    )
 
     class Meta:
         verbose_name = 'публикация'
         verbose_name_plural = 'Публикации'
         ordering = ('-pub_date',)
+        indexes = (
+            models.Index(
+                fields=('-pub_date', '-id'),
+                condition=models.Q(is_visible=True),
+                name='post_feed_idx'
+            ),
+            models.Index(
+                fields=('category', '-pub_date', '-id'),
+                condition=models.Q(is_visible=True),
+                name='post_category_feed_idx'
+            ),
+            models.Index(
+                fields=('pub_date',),
+                condition=models.Q(is_visible=False, is_published=True),
+                name='post_scheduled_idx'
+            ),
+            models.Index(
+                fields=('author', '-pub_date', '-id'),
+                name='post_author_feed_idx'
+            ),
+        )
 
     def __str__(self):
         return (
@@ -104,7 +181,95 @@ class Post(PublishCreateModel):
         )
 
     def get_absolute_url(self):
-        return reverse('blog:detail', kwargs={'pk': self.pk})
+        return reverse('blog:post_detail', kwargs={'post_id': self.pk})
+
+    def delete(self, *args, **kwargs):
+        with deleting_posts([self.pk]):
+            return super().delete(*args, **kwargs)
+
+
+class FeedEntry(models.Model):
+    """Видимая публикация в общей ленте и ленте категории.
+
+    Узкая таблица с ключом сортировки ленты: её поддерживают сигналы,
+    а представления выбирают из неё только страницу идентификаторов.
+    """
+
+    post = models.OneToOneField(
+        Post,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        verbose_name='Публикация',
+        related_name='feed_entry'
+    )
+    pub_date = models.DateTimeField('Дата и время публикации')
+    category = models.ForeignKey(
+        Category,
+        on_delete=models.CASCADE,
+        verbose_name='Категория',
+        related_name='feed_entries'
+    )
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        verbose_name='Автор публикации',
+        related_name='feed_entries'
+    )
+
+    class Meta:
+        verbose_name = 'запись ленты'
+        verbose_name_plural = 'Записи ленты'
+        indexes = (
+            models.Index(
+                fields=('-pub_date', '-post'),
+                name='feedentry_feed_idx'
+            ),
+            models.Index(
+                fields=('category', '-pub_date', '-post'),
+                name='feedentry_category_idx'
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.post_id} {self.pub_date}'
+
+
+class SearchDocumentField(models.TextField):
+    """Скрытый столбец FTS5 с именем таблицы: по нему делается MATCH."""
+
+
+@SearchDocumentField.register_lookup
+class Match(models.Lookup):
+    lookup_name = 'match'
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f'{lhs} MATCH {rhs}', lhs_params + rhs_params
+
+
+class PostSearchIndex(models.Model):
+    """Полнотекстовый индекс публикаций в SQLite.
+
+    Виртуальная таблица FTS5 создаётся миграцией и обновляется триггерами
+    базы данных, поэтому Django ею не управляет.
+    """
+
+    post = models.OneToOneField(
+        Post,
+        on_delete=models.DO_NOTHING,
+        primary_key=True,
+        db_column='rowid',
+        related_name='search_index'
+    )
+    title = models.CharField('Заголовок', max_length=256)
+    text = models.TextField('Текст')
+    document = SearchDocumentField(db_column='blog_post_fts')
+    rank = models.FloatField()
+
+    class Meta:
+        managed = False
+        db_table = 'blog_post_fts'
 
 
 class Comment(models.Model):
@@ -125,3 +290,52 @@ class Comment(models.Model):
         verbose_name = 'комментарий'
         verbose_name_plural = 'Комментарии'
         ordering = ('created_at',)
+        indexes = (
+            # Окно обсуждения выбирается по курсору (created_at, id).
+            models.Index(
+                fields=('post', 'created_at', 'id'),
+                name='comment_thread_idx'
+            ),
+        )
+
+
+class ImageTask(models.Model):
+
+    class Status(models.TextChoices):
+        PENDING = 'pending', 'В очереди'
+        RUNNING = 'running', 'Выполняется'
+        DONE = 'done', 'Готово'
+        FAILED = 'failed', 'Ошибка'
+
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        verbose_name='Публикация',
+        related_name='image_tasks'
+    )
+    image = models.CharField('Файл', max_length=256)
+    status = models.CharField(
+        'Статус',
+        max_length=16,
+        choices=Status.choices,
+        default=Status.PENDING
+    )
+    attempts = models.PositiveSmallIntegerField('Попыток', default=0)
+    last_error = models.TextField('Последняя ошибка', blank=True)
+    run_after = models.DateTimeField('Не раньше', default=timezone.now)
+    created_at = models.DateTimeField('Добавлено', auto_now_add=True)
+    updated_at = models.DateTimeField('Изменено', auto_now=True)
+
+    class Meta:
+        verbose_name = 'задача обработки изображения'
+        verbose_name_plural = 'Задачи обработки изображений'
+        ordering = ('run_after', 'id')
+        indexes = (
+            models.Index(
+                fields=('status', 'run_after'),
+                name='imagetask_queue_idx'
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.image} {self.status} {self.attempts}'
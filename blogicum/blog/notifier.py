@@ -0,0 +1,77 @@
+import asyncio
+import threading
+from collections import defaultdict
+
+# Столько событий ждёт медленного читателя; остальные отбрасываются,
+# а пропущенное он дочитает через окно комментариев.
+QUEUE_SIZE = 100
+
+
+class Notifier:
+    """Рассылка событий подписчикам одного процесса.
+
+    Подписчики живут в цикле событий ASGI-сервера, а публикуют
+    синхронные представления из потоков, поэтому события передаются
+    в цикл через call_soon_threadsafe. Между процессами события
+    не передаются.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = defaultdict(dict)
+
+    def subscribe(self, channel):
+        queue = asyncio.Queue(QUEUE_SIZE)
+        with self._lock:
+            self._subscribers[channel][queue] = asyncio.get_running_loop()
+        return queue
+
+    def unsubscribe(self, channel, queue):
+        with self._lock:
+            subscribers = self._subscribers[channel]
+            subscribers.pop(queue, None)
+            if not subscribers:
+                del self._subscribers[channel]
+
+    def subscriber_count(self, channel):
+        with self._lock:
+            return len(self._subscribers.get(channel, ()))
+
+    @staticmethod
+    def _put(queue, event):
+        try:
+            queue.put_nowait(event)
+        except asyncio.QueueFull:
+            pass
+
+    def publish(self, channel, event):
+        with self._lock:
+            subscribers = list(self._subscribers.get(channel, {}).items())
+        for queue, loop in subscribers:
+            try:
+                loop.call_soon_threadsafe(self._put, queue, event)
+            except RuntimeError:
+                # Цикл событий уже закрыт.
+                self.unsubscribe(channel, queue)
+
+
+comment_notifier = Notifier()
+
+
+def comment_channel(post_id):
+    return f'comments:{post_id}'
+
+
+def comment_event(comment):
+    return {
+        'id': comment.id,
+        'author': comment.author.username,
+        'text': comment.text,
+        'created_at': comment.created_at.isoformat(),
+    }
+
+
+def publish_comment(comment):
+    comment_notifier.publish(
+        comment_channel(comment.post_id), comment_event(comment)
+    )
@@ -0,0 +1,148 @@
+import base64
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from django.http import Http404
+
+
+def encode_cursor(values, reverse=False):
+    # DjangoJSONEncoder округляет время до миллисекунд, и условие «после
+    # курсора» пропускало бы строки; str() сохраняет микросекунды.
+    payload = json.dumps([int(reverse), *values], default=str)
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    padded = cursor + '=' * (-len(cursor) % 4)
+    try:
+        reverse, *values = json.loads(base64.urlsafe_b64decode(padded))
+    except (ValueError, TypeError):
+        raise Http404('Некорректный курсор пагинации.')
+    return values, bool(reverse)
+
+
+class KeysetPage:
+
+    def __init__(self, object_list, paginator, has_next, has_previous):
+        self.object_list = object_list
+        self.paginator = paginator
+        # Курсоры считаются по строкам выборки, даже если представление
+        # потом заменит object_list, например, загруженными публикациями.
+        self._bounds = (object_list[0], object_list[-1]) if object_list else ()
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+    @property
+    def next_cursor(self):
+        if not self.has_next() or not self._bounds:
+            return None
+        return self.paginator.cursor_for(self._bounds[-1])
+
+    @property
+    def previous_cursor(self):
+        if not self.has_previous() or not self._bounds:
+            return None
+        return self.paginator.cursor_for(self._bounds[0], reverse=True)
+
+    @property
+    def end_cursor(self):
+        """Курсор после последней строки, даже если дальше пока пусто.
+
+        По нему можно периодически дозапрашивать новые строки.
+        """
+        if not self._bounds:
+            return None
+        return self.paginator.cursor_for(self._bounds[-1])
+
+
+class KeysetPaginator:
+    """Пагинация по ключу сортировки вместо OFFSET и COUNT.
+
+    Страница выбирается условием «строго после курсора», поэтому время
+    запроса не зависит от глубины страницы. Последнее поле ``ordering``
+    должно быть уникальным (обычно ``id``).
+    """
+
+    is_keyset = True
+
+    def __init__(self, queryset, per_page, ordering=('-pub_date', '-id')):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.ordering = ordering
+        self.fields = [name.lstrip('-') for name in ordering]
+
+    def cursor_for(self, obj, reverse=False):
+        return encode_cursor(
+            [getattr(obj, name) for name in self.fields], reverse
+        )
+
+    def _get_field(self, name):
+        # Сортировать можно и по аннотации, например по рангу поиска.
+        annotations = self.queryset.query.annotations
+        if name in annotations:
+            return annotations[name].output_field
+        return self.queryset.model._meta.get_field(name)
+
+    def _to_python(self, values):
+        if len(values) != len(self.fields):
+            raise Http404('Некорректный курсор пагинации.')
+        try:
+            return [
+                self._get_field(name).to_python(value)
+                for name, value in zip(self.fields, values)
+            ]
+        except (ValidationError, TypeError, ValueError):
+            raise Http404('Некорректный курсор пагинации.')
+
+    def _seek_filter(self, values, reverse):
+        condition = Q()
+        equal = Q()
+        for order, name, value in zip(self.ordering, self.fields, values):
+            descending = order.startswith('-') != reverse
+            lookup = f'{name}__lt' if descending else f'{name}__gt'
+            condition |= equal & Q(**{lookup: value})
+            equal &= Q(**{name: value})
+        return condition
+
+    def page(self, cursor=None):
+        reverse = False
+        queryset = self.queryset
+        if cursor:
+            values, reverse = decode_cursor(cursor)
+            queryset = queryset.filter(
+                self._seek_filter(self._to_python(values), reverse)
+            )
+        ordering = self.ordering
+        if reverse:
+            ordering = [
+                name[1:] if name.startswith('-') else f'-{name}'
+                for name in ordering
+            ]
+        object_list = list(
+            queryset.order_by(*ordering)[:self.per_page + 1]
+        )
+        has_more = len(object_list) > self.per_page
+        object_list = object_list[:self.per_page]
+        if reverse:
+            object_list.reverse()
+            return KeysetPage(object_list, self, True, has_more)
+        return KeysetPage(object_list, self, has_more, bool(cursor))
@@ -0,0 +1,165 @@
+from django.db import transaction
+from django.db.models import BooleanField, Case, Exists, OuterRef, When
+from django.dispatch import Signal
+from django.utils import timezone
+
+from .models import Category, FeedEntry, Post
+
+# Поля публикации, от которых зависит её запись в ленте.
+FEED_FIELDS = frozenset(
+    ('is_published', 'is_visible', 'pub_date', 'category', 'author')
+)
+# Отправляется, когда публикации стали видны в лентах; аргумент posts —
+# список таких публикаций.
+posts_published = Signal()
+# Отправляется после массовой смены видимости категорий; аргументы:
+# category_ids и is_published.
+categories_published_changed = Signal()
+
+
+def should_be_visible(post, now=None):
+    return (
+        post.is_published
+        and post.category_id is not None
+        and post.category.is_published
+        and post.pub_date <= (now or timezone.now())
+    )
+
+
+def refresh_visibility(queryset, now=None):
+    """Пересчитывает признак видимости публикаций одним UPDATE."""
+    published_category = Exists(Category.objects.filter(
+        pk=OuterRef('category_id'), is_published=True
+    ))
+    return queryset.update(is_visible=Case(
+        When(
+            published_category,
+            is_published=True,
+            pub_date__lte=now or timezone.now(),
+            then=True
+        ),
+        default=False,
+        output_field=BooleanField()
+    ))
+
+
+def due_posts(now=None):
+    return Post.objects.filter(
+        is_visible=False,
+        is_published=True,
+        category__is_published=True,
+        pub_date__lte=now or timezone.now()
+    )
+
+
+def publish_due_posts(now=None):
+    """Показывает в лентах публикации, время которых наступило."""
+    now = now or timezone.now()
+    posts = list(
+        due_posts(now).only('pk', 'pub_date', 'category_id', 'author_id')
+    )
+    if posts:
+        Post.objects.filter(
+            pk__in=[post.pk for post in posts], is_visible=False
+        ).update(is_visible=True)
+        posts_published.send(sender=Post, posts=posts)
+    return posts
+
+
+def next_publication_date(now=None):
+    return Post.objects.filter(
+        is_visible=False,
+        is_published=True,
+        category__is_published=True,
+        pub_date__gt=now or timezone.now()
+    ).order_by('pub_date').values_list('pub_date', flat=True).first()
+
+
+def feed_entry(post):
+    return FeedEntry(
+        post_id=post.pk,
+        pub_date=post.pub_date,
+        category_id=post.category_id,
+        author_id=post.author_id
+    )
+
+
+def sync_feed_entry(post):
+    if not post.is_visible:
+        FeedEntry.objects.filter(post_id=post.pk).delete()
+        return
+    FeedEntry.objects.update_or_create(
+        post_id=post.pk,
+        defaults={
+            'pub_date': post.pub_date,
+            'category_id': post.category_id,
+            'author_id': post.author_id,
+        }
+    )
+
+
+def rebuild_feed_entries(posts, batch_size=1000):
+    """Пересоздаёт записи ленты для публикаций из queryset posts."""
+    FeedEntry.objects.filter(post__in=posts).delete()
+    visible = posts.filter(is_visible=True).only(
+        'pk', 'pub_date', 'category_id', 'author_id'
+    )
+    return len(FeedEntry.objects.bulk_create(
+        map(feed_entry, visible.iterator()), batch_size=batch_size
+    ))
+
+
+def sync_category_posts(category_ids, batch_size=1000):
+    """Пересчитывает видимость и ленту публикаций категорий пакетами.
+
+    Возвращает число публикаций, которые теперь видны в лентах.
+    """
+    posts = Post.objects.filter(category__in=category_ids)
+    last_pk = 0
+    visible = 0
+    while True:
+        pks = list(
+            posts.filter(pk__gt=last_pk)
+            .order_by('pk')
+            .values_list('pk', flat=True)[:batch_size]
+        )
+        if not pks:
+            return visible
+        batch = Post.objects.filter(pk__in=pks)
+        refresh_visibility(batch)
+        visible += rebuild_feed_entries(batch, batch_size)
+        last_pk = pks[-1]
+
+
+def set_categories_published(categories, is_published, batch_size=1000):
+    """Публикует или скрывает категории вместе с их публикациями.
+
+    Сигналы моделей не отправляются: производные данные обновляются
+    пакетными запросами, число которых не зависит от числа публикаций
+    при скрытии и растёт на пакет при публикации. Возвращает пару
+    (изменено категорий, публикаций появилось или пропало в лентах).
+    """
+    with transaction.atomic():
+        category_ids = list(
+            Category.objects.filter(pk__in=categories)
+            .exclude(is_published=is_published)
+            .values_list('pk', flat=True)
+        )
+        if not category_ids:
+            return 0, 0
+        Category.objects.filter(pk__in=category_ids).update(
+            is_published=is_published
+        )
+        if is_published:
+            affected = sync_category_posts(category_ids, batch_size)
+        else:
+            affected, _ = FeedEntry.objects.filter(
+                category__in=category_ids
+            ).delete()
+            Post.objects.filter(
+                category__in=category_ids, is_visible=True
+            ).update(is_visible=False)
+    categories_published_changed.send(
+        sender=Category, category_ids=category_ids, is_published=is_published
+    )
+    return len(category_ids), affected
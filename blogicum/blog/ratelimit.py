@@ -0,0 +1,63 @@
+import math
+import time
+from http import HTTPStatus
+
+from django.conf import settings
+from django.core.cache import cache
+from django.shortcuts import render
+
+from .cache import record_rate_limited
+
+BUCKET_KEY = 'blog:ratelimit:{}:{}'
+
+
+def take_token(key, burst, per_minute, now=None):
+    """Берёт жетон из корзины в кэше.
+
+    Возвращает пару (разрешено ли, через сколько секунд появится жетон).
+    Корзина читается и записывается без блокировки, поэтому при гонке
+    параллельные запросы могут получить на жетон-другой больше.
+    """
+    now = now or time.time()
+    rate = per_minute / 60
+    tokens, updated = cache.get(key) or (burst, now)
+    tokens = min(burst, tokens + (now - updated) * rate)
+    allowed = tokens >= 1
+    if allowed:
+        tokens -= 1
+    # Когда ключ истекает, корзина уже полна: хранить её дольше незачем.
+    cache.set(key, (tokens, now), math.ceil((burst - tokens) / rate) or 1)
+    return allowed, 0 if allowed else (1 - tokens) / rate
+
+
+def client_key(request):
+    if request.user.is_authenticated:
+        return f'user:{request.user.pk}'
+    return f'ip:{request.META.get("REMOTE_ADDR", "")}'
+
+
+class RateLimitMixin:
+    """Ограничивает частоту записей: корзина жетонов на пользователя.
+
+    Анонимы ограничиваются по IP. Параметры области rate_limit_scope
+    берутся из settings.RATE_LIMITS; превышение даёт ответ 429.
+    """
+
+    rate_limit_scope = None
+
+    def dispatch(self, request, *args, **kwargs):
+        limit = settings.RATE_LIMITS.get(self.rate_limit_scope)
+        if request.method != 'POST' or not limit:
+            return super().dispatch(request, *args, **kwargs)
+        allowed, retry_after = take_token(
+            BUCKET_KEY.format(self.rate_limit_scope, client_key(request)),
+            **limit
+        )
+        if allowed:
+            return super().dispatch(request, *args, **kwargs)
+        record_rate_limited()
+        response = render(
+            request, 'pages/429.html', status=HTTPStatus.TOO_MANY_REQUESTS
+        )
+        response['Retry-After'] = math.ceil(retry_after)
+        return response
@@ -0,0 +1,76 @@
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+
+PRIMARY_UNTIL_KEY = 'primary_until'
+# Сессии всегда читаются из основной базы: после входа реплика может
+# ещё не знать о новой сессии.
+PRIMARY_ONLY_APPS = frozenset(('sessions',))
+
+_replica_reads = ContextVar('replica_reads', default=None)
+
+
+class ReplicaReads:
+    """Отмечает, пришло ли хоть одно чтение из реплики."""
+
+    used = False
+
+
+@contextmanager
+def _route_reads(reads):
+    token = _replica_reads.set(reads)
+    try:
+        yield reads
+    finally:
+        _replica_reads.reset(token)
+
+
+def read_from_replicas():
+    return _route_reads(ReplicaReads())
+
+
+def read_from_primary():
+    """Возвращает чтения в основную базу внутри read_from_replicas()."""
+    return _route_reads(None)
+
+
+def pin_to_primary(request):
+    """Направляет чтения сессии в основную базу на время отставания реплик."""
+    request.session[PRIMARY_UNTIL_KEY] = (
+        time.time() + settings.REPLICA_STICKY_SECONDS
+    )
+
+
+def is_pinned_to_primary(request):
+    return request.session.get(PRIMARY_UNTIL_KEY, 0) > time.time()
+
+
+class ReplicaRouter:
+    """Отправляет в реплики чтения внутри read_from_replicas()."""
+
+    def db_for_read(self, model, **hints):
+        reads = _replica_reads.get()
+        if (
+            settings.DATABASE_REPLICAS
+            and reads is not None
+            and model._meta.app_label not in PRIMARY_ONLY_APPS
+        ):
+            reads.used = True
+            return random.choice(settings.DATABASE_REPLICAS)
+        return 'default'
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {'default', *settings.DATABASE_REPLICAS}
+        if {obj1._state.db, obj2._state.db} <= databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Реплики получают схему вместе с данными при синхронизации.
+        return db not in settings.DATABASE_REPLICAS
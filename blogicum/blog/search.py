@@ -0,0 +1,158 @@
+import re
+from contextlib import contextmanager
+
+from django.db import connection, connections
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+from .models import Post, PostSearchIndex
+
+SEARCH_CONFIG = 'russian'
+# Порядок выдачи для KeysetPaginator: последнее поле уникально.
+SQLITE_SEARCH_ORDERING = ('rank', '-post_id')
+POSTGRES_SEARCH_ORDERING = ('-rank', '-id')
+SEARCH_ORDERING = ('-pub_date', '-id')
+# Выражение должно совпадать с индексом из миграции 0012, иначе
+# PostgreSQL не сможет его использовать.
+POSTGRES_DOCUMENT = (
+    "to_tsvector('russian', coalesce(\"blog_post\".\"title\", '')"
+    " || ' ' || coalesce(\"blog_post\".\"text\", ''))"
+)
+# Таблица публикаций в SQLite пересоздаётся при многих изменениях схемы,
+# и её триггеры пропадают вместе со старой таблицей.
+SQLITE_TRIGGERS = (
+    """
+    CREATE TRIGGER IF NOT EXISTS blog_post_fts_insert
+    AFTER INSERT ON blog_post BEGIN
+        INSERT INTO blog_post_fts (rowid, title, text)
+        VALUES (new.id, new.title, new.text);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS blog_post_fts_delete
+    AFTER DELETE ON blog_post BEGIN
+        INSERT INTO blog_post_fts (blog_post_fts, rowid, title, text)
+        VALUES ('delete', old.id, old.title, old.text);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS blog_post_fts_update
+    AFTER UPDATE OF title, text ON blog_post BEGIN
+        INSERT INTO blog_post_fts (blog_post_fts, rowid, title, text)
+        VALUES ('delete', old.id, old.title, old.text);
+        INSERT INTO blog_post_fts (rowid, title, text)
+        VALUES (new.id, new.title, new.text);
+    END
+    """,
+)
+SQLITE_TRIGGER_NAMES = (
+    'blog_post_fts_insert', 'blog_post_fts_delete', 'blog_post_fts_update'
+)
+SQLITE_REBUILD = (
+    "INSERT INTO blog_post_fts (blog_post_fts) VALUES ('rebuild')"
+)
+
+
+def search_terms(query):
+    return re.findall(r'\w+', query.lower())
+
+
+def sqlite_match(terms):
+    return ' '.join(f'"{term}"*' for term in terms)
+
+
+def install_sqlite_triggers(using):
+    """Восстанавливает триггеры индекса, если таблица индекса есть."""
+    db = connections[using]
+    if db.vendor != 'sqlite':
+        return
+    with db.cursor() as cursor:
+        if 'blog_post_fts' not in db.introspection.table_names(cursor):
+            return
+        for sql in SQLITE_TRIGGERS:
+            cursor.execute(sql)
+
+
+@contextmanager
+def sqlite_index_deferred(using):
+    """Снимает триггеры индекса на время массовой записи.
+
+    После записи индекс перестраивается целиком: это быстрее, чем
+    обновлять его триггером на каждую вставленную строку.
+    """
+    db = connections[using]
+    if db.vendor != 'sqlite':
+        yield
+        return
+    with db.cursor() as cursor:
+        if 'blog_post_fts' not in db.introspection.table_names(cursor):
+            yield
+            return
+        for name in SQLITE_TRIGGER_NAMES:
+            cursor.execute(f'DROP TRIGGER IF EXISTS {name}')
+    try:
+        yield
+    finally:
+        with db.cursor() as cursor:
+            for sql in SQLITE_TRIGGERS:
+                cursor.execute(sql)
+            cursor.execute(SQLITE_REBUILD)
+
+
+def search_results(query):
+    """Выдача поиска по видимым публикациям и её порядок для пагинации.
+
+    В SQLite выдача — узкие строки индекса: ранжирование с LIMIT
+    не трогает строки публикаций, а сами публикации страницы
+    загружаются потом по ключу. В других СУБД выдача — публикации.
+    """
+    terms = search_terms(query)
+    if connection.vendor == 'sqlite' and terms:
+        return PostSearchIndex.objects.filter(
+            document__match=sqlite_match(terms),
+            post__is_visible=True
+        ).only('post_id', 'rank'), SQLITE_SEARCH_ORDERING
+    if connection.vendor == 'postgresql':
+        ordering = POSTGRES_SEARCH_ORDERING
+    else:
+        ordering = SEARCH_ORDERING
+    return search_posts(Post.objects.filter(is_visible=True), query), ordering
+
+
+def search_posts(queryset, query):
+    """Отбирает из queryset публикации по запросу, лучшие — первыми.
+
+    Слова запроса ищутся все сразу; в SQLite совпадение засчитывается
+    и по началу слова.
+    """
+    terms = search_terms(query)
+    if not terms:
+        return queryset.none()
+    if connection.vendor == 'sqlite':
+        return queryset.filter(
+            search_index__document__match=sqlite_match(terms)
+        ).order_by('search_index__rank', '-pub_date', '-id')
+    if connection.vendor == 'postgresql':
+        from django.contrib.postgres.search import (
+            SearchQuery,
+            SearchRank,
+            SearchVectorField
+        )
+
+        document = RawSQL(
+            POSTGRES_DOCUMENT, (), output_field=SearchVectorField()
+        )
+        search_query = SearchQuery(
+            ' '.join(terms), config=SEARCH_CONFIG, search_type='plain'
+        )
+        return queryset.annotate(
+            document=document,
+            rank=SearchRank(document, search_query)
+        ).filter(document=search_query).order_by(
+            '-rank', '-pub_date', '-id'
+        )
+    for term in terms:
+        queryset = queryset.filter(
+            Q(title__icontains=term) | Q(text__icontains=term)
+        )
+    return queryset.order_by('-pub_date', '-id')
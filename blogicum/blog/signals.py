@@ -0,0 +1,187 @@
+from django.db.backends.signals import connection_created
+from django.db.models import F
+from django.db.models.signals import (
+    post_delete,
+    post_migrate,
+    post_save,
+    pre_save
+)
+from django.dispatch import receiver
+
+from .cache import (
+    GLOBAL_SCOPE,
+    invalidate,
+    post_scope,
+    post_scopes,
+    profile_scope
+)
+from .db import apply_sqlite_pragmas
+from .models import (
+    Category,
+    Comment,
+    FeedEntry,
+    Location,
+    Post,
+    User,
+    deleting_post_ids
+)
+from .publishing import (
+    FEED_FIELDS,
+    categories_published_changed,
+    feed_entry,
+    posts_published,
+    should_be_visible,
+    sync_category_posts,
+    sync_feed_entry
+)
+from .search import install_sqlite_triggers
+
+
+@receiver(post_save, sender=Comment)
+def increment_comment_count(sender, instance, created, raw=False, **kwargs):
+    # При loaddata счётчики восстанавливает команда recount_comments.
+    if created and not raw:
+        Post.objects.filter(pk=instance.post_id).update(
+            comment_count=F('comment_count') + 1
+        )
+        invalidate(*post_scopes(instance.post))
+
+
+@receiver(post_save, sender=Comment)
+def invalidate_edited_comment_post(sender, instance, created, raw=False,
+                                   **kwargs):
+    if not created and not raw:
+        invalidate(post_scope(instance.post_id))
+
+
+@receiver(post_delete, sender=Comment)
+def decrement_comment_count(sender, instance, **kwargs):
+    if instance.post_id in deleting_post_ids.get():
+        return
+    Post.objects.filter(pk=instance.post_id, comment_count__gt=0).update(
+        comment_count=F('comment_count') - 1
+    )
+    post = Post.objects.filter(pk=instance.post_id).first()
+    if post is not None:
+        invalidate(*post_scopes(post))
+
+
+@receiver(pre_save, sender=Post)
+def remember_post_scopes(sender, instance, raw=False, **kwargs):
+    # Публикация могла сменить категорию или автора: старые ленты
+    # тоже нужно сбросить.
+    instance._previous_state = None
+    if instance.pk and not raw:
+        instance._previous_state = Post.objects.filter(
+            pk=instance.pk
+        ).only('category_id', 'author_id').first()
+
+
+@receiver(pre_save, sender=Post)
+def update_post_visibility(sender, instance, raw=False, **kwargs):
+    if not raw:
+        instance.is_visible = should_be_visible(instance)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def invalidate_post_feeds(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    posts = [instance]
+    previous = getattr(instance, '_previous_state', None)
+    if previous is not None:
+        posts.append(previous)
+    invalidate(*post_scopes(*posts))
+
+
+@receiver(post_save, sender=Post)
+def update_post_feed_entry(sender, instance, raw=False, update_fields=None,
+                           **kwargs):
+    if raw:
+        return
+    if update_fields is not None and not FEED_FIELDS & set(update_fields):
+        return
+    sync_feed_entry(instance)
+
+
+@receiver(posts_published)
+def add_published_feed_entries(sender, posts, **kwargs):
+    FeedEntry.objects.bulk_create(
+        map(feed_entry, posts), ignore_conflicts=True
+    )
+    invalidate(*post_scopes(*posts))
+
+
+@receiver(pre_save, sender=Category)
+def remember_category_published(sender, instance, raw=False, **kwargs):
+    instance._was_published = None
+    if instance.pk and not raw:
+        instance._was_published = Category.objects.filter(
+            pk=instance.pk
+        ).values_list('is_published', flat=True).first()
+
+
+@receiver(post_save, sender=Category)
+def update_category_visibility(sender, instance, raw=False, **kwargs):
+    was_published = getattr(instance, '_was_published', None)
+    if not raw and was_published not in (None, instance.is_published):
+        sync_category_posts([instance.pk])
+
+
+@receiver(post_delete, sender=Category)
+def hide_uncategorized_posts(sender, instance, **kwargs):
+    # Публикации удалённой категории остаются без категории.
+    Post.objects.filter(category=None, is_visible=True).update(
+        is_visible=False
+    )
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def invalidate_all_feeds(sender, raw=False, **kwargs):
+    if not raw:
+        invalidate(GLOBAL_SCOPE)
+
+
+@receiver(categories_published_changed)
+def invalidate_category_feeds(sender, **kwargs):
+    invalidate(GLOBAL_SCOPE)
+
+
+@receiver(pre_save, sender=User)
+def invalidate_renamed_user_feeds(sender, instance, raw=False,
+                                  update_fields=None, **kwargs):
+    if raw or not instance.pk:
+        return
+    if update_fields is not None and 'username' not in update_fields:
+        return
+    previous = User.objects.filter(
+        pk=instance.pk
+    ).values_list('username', flat=True).first()
+    if previous is not None and previous != instance.username:
+        invalidate(GLOBAL_SCOPE, profile_scope(previous))
+
+
+@receiver(post_save, sender=User)
+def invalidate_user_profile(sender, instance, raw=False, update_fields=None,
+                            **kwargs):
+    # Вход пользователя меняет только last_login, которого нет на страницах.
+    if raw or set(update_fields or ()) == {'last_login'}:
+        return
+    invalidate(profile_scope(instance.username))
+
+
+@receiver(post_migrate)
+def restore_search_triggers(sender, using, **kwargs):
+    # Изменение схемы в SQLite пересоздаёт таблицу публикаций вместе
+    # с её триггерами.
+    if sender.name == 'blog':
+        install_sqlite_triggers(using)
+
+
+@receiver(connection_created)
+def configure_sqlite_connection(sender, connection, **kwargs):
+    apply_sqlite_pragmas(connection)
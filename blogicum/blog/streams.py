@@ -0,0 +1,112 @@
+import asyncio
+import json
+import re
+
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections
+
+from .models import Post
+from .notifier import comment_channel, comment_notifier
+
+COMMENT_STREAM_PATH = re.compile(r'/posts/(?P<post_id>\d+)/comments/stream/')
+# Комментарий SSE раз в столько секунд не даёт прокси закрыть соединение.
+KEEPALIVE_INTERVAL = 15
+
+
+@sync_to_async
+def is_visible_post(post_id):
+    # Вне обработчика Django соединения с базой закрываем сами.
+    close_old_connections()
+    try:
+        return Post.objects.filter(pk=post_id, is_visible=True).exists()
+    finally:
+        close_old_connections()
+
+
+def format_event(event):
+    return (
+        f'id: {event["id"]}\n'
+        f'event: comment\n'
+        f'data: {json.dumps(event, ensure_ascii=False)}\n\n'
+    ).encode()
+
+
+async def send_response(send, status, body=b''):
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [(b'content-type', b'text/plain; charset=utf-8')],
+    })
+    await send({'type': 'http.response.body', 'body': body})
+
+
+async def wait_for_disconnect(receive):
+    while (await receive())['type'] != 'http.disconnect':
+        pass
+
+
+async def comment_stream(scope, receive, send, post_id):
+    """Поток server-sent events о новых комментариях публикации."""
+    if scope['method'] != 'GET':
+        await send_response(send, 405)
+        return
+    if not await is_visible_post(post_id):
+        await send_response(send, 404, 'Публикация не найдена.'.encode())
+        return
+    channel = comment_channel(post_id)
+    queue = comment_notifier.subscribe(channel)
+    disconnected = asyncio.ensure_future(wait_for_disconnect(receive))
+    try:
+        await send({
+            'type': 'http.response.start',
+            'status': 200,
+            'headers': [
+                (b'content-type', b'text/event-stream; charset=utf-8'),
+                (b'cache-control', b'no-cache'),
+                # nginx не должен копить поток в буфере.
+                (b'x-accel-buffering', b'no'),
+            ],
+        })
+        await send({
+            'type': 'http.response.body',
+            'body': f'retry: {KEEPALIVE_INTERVAL * 1000}\n\n'.encode(),
+            'more_body': True,
+        })
+        while not disconnected.done():
+            event = asyncio.ensure_future(queue.get())
+            await asyncio.wait(
+                (event, disconnected),
+                timeout=KEEPALIVE_INTERVAL,
+                return_when=asyncio.FIRST_COMPLETED
+            )
+            if event.done():
+                body = format_event(event.result())
+            else:
+                event.cancel()
+                body = b': keepalive\n\n'
+            if not disconnected.done():
+                await send({
+                    'type': 'http.response.body',
+                    'body': body,
+                    'more_body': True,
+                })
+    finally:
+        disconnected.cancel()
+        comment_notifier.unsubscribe(channel, queue)
+
+
+class CommentStreamRouter:
+    """ASGI-приложение: поток комментариев, остальное — Django."""
+
+    def __init__(self, application):
+        self.application = application
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'http':
+            match = COMMENT_STREAM_PATH.fullmatch(scope['path'])
+            if match:
+                await comment_stream(
+                    scope, receive, send, int(match['post_id'])
+                )
+                return
+        await self.application(scope, receive, send)
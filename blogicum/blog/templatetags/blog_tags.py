@@ -0,0 +1,46 @@
+from django import template
+from django.conf import settings
+from django.core.cache import cache
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+
+from ..cache import GLOBAL_SCOPE, card_cache_key, get_generations
+from ..images import IMAGE_WIDTHS, VARIANT_FORMATS, image_sources, variant_url
+
+register = template.Library()
+
+
+@register.inclusion_tag('includes/post_image.html')
+def post_image(post, sizes='(max-width: 40rem) 100vw, 40rem'):
+    # Пока копии не готовы, показываем оригинал.
+    if post.image_status != post.ImageStatus.READY:
+        return {'post': post, 'sources': [], 'src': post.image.url}
+    return {
+        'post': post,
+        'sources': image_sources(post.image),
+        'sizes': sizes,
+        # Для браузеров без <picture>: средняя копия в самом совместимом
+        # формате.
+        'src': variant_url(
+            post.image, IMAGE_WIDTHS[len(IMAGE_WIDTHS) // 2],
+            VARIANT_FORMATS[-1][0]
+        ),
+    }
+
+
+@register.simple_tag(takes_context=True)
+def post_card(context, post):
+    """Карточка публикации; её HTML не зависит от зрителя и кэшируется."""
+    if not settings.FEED_CACHE_TIMEOUT:
+        return render_to_string('includes/post_card.html', {'post': post})
+    # Поколение читается из кэша один раз за отрисовку страницы.
+    if 'card_generation' not in context.render_context:
+        context.render_context['card_generation'] = get_generations(
+            GLOBAL_SCOPE
+        )[0]
+    key = card_cache_key(post, context.render_context['card_generation'])
+    html = cache.get(key)
+    if html is None:
+        html = render_to_string('includes/post_card.html', {'post': post})
+        cache.set(key, html, settings.FEED_CACHE_TIMEOUT)
+    return mark_safe(html)
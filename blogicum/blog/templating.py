@@ -0,0 +1,32 @@
+from pathlib import Path
+
+from django.core.exceptions import ImproperlyConfigured
+from django.template import TemplateSyntaxError, engines
+
+
+def template_names(directory):
+    directory = Path(directory)
+    return sorted(
+        path.relative_to(directory).as_posix()
+        for path in directory.rglob('*.html')
+    )
+
+
+def precompile_templates():
+    """Компилирует шаблоны из DIRS всех движков и возвращает их число.
+
+    С кэширующим загрузчиком скомпилированные шаблоны остаются в памяти
+    процесса. Ошибка в любом шаблоне останавливает запуск.
+    """
+    compiled = 0
+    for engine in engines.all():
+        for directory in getattr(engine, 'dirs', ()):
+            for name in template_names(directory):
+                try:
+                    engine.get_template(name)
+                except TemplateSyntaxError as error:
+                    raise ImproperlyConfigured(
+                        f'Ошибка в шаблоне {name}: {error}'
+                    ) from error
+                compiled += 1
+    return compiled
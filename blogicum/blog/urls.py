@@ -1,25 +1,28 @@
 from django.urls import path
 
-from . import views
+from . import feeds, views
 
 app_name = 'blog'
 
 urlpatterns = [
     path('',
-         views.IndexListView.as_view(),
+         views.read_view(views.IndexListView),
          name='index'),
     path('profile/edit_profile/',
          views.ProfileUpdateView.as_view(),
          name='edit_profile'),
     path('profile/<slug:username>/',
-         views.ProfileListView.as_view(),
+         views.read_view(views.ProfileListView),
          name='profile'),
     path('posts/create/',
          views.PostCreateView.as_view(),
          name='create_post'),
     path('posts/<int:post_id>/',
-         views.PostDetailView.as_view(),
+         views.read_view(views.PostDetailView),
          name='post_detail'),
+    path('posts/<int:post_id>/comments/',
+         views.CommentThreadView.as_view(),
+         name='comments'),
     path('posts/<int:post_id>/comment/',
          views.CommentCreateView.as_view(),
          name='add_comment'),
@@ -36,6 +39,27 @@ urlpatterns = [
          views.PostUpdateView.as_view(),
          name='edit_post'),
     path('category/<slug:category_slug>/',
-         views.CategoryListView.as_view(),
+         views.read_view(views.CategoryListView),
          name='category_posts'),
+    path('feed/',
+         feeds.LatestPostsFeed(),
+         name='index_feed'),
+    path('feed/atom/',
+         feeds.LatestPostsAtomFeed(),
+         name='index_atom_feed'),
+    path('category/<slug:category_slug>/feed/',
+         feeds.CategoryPostsFeed(),
+         name='category_feed'),
+    path('category/<slug:category_slug>/feed/atom/',
+         feeds.CategoryPostsAtomFeed(),
+         name='category_atom_feed'),
+    path('profile/<slug:username>/feed/',
+         feeds.AuthorPostsFeed(),
+         name='profile_feed'),
+    path('profile/<slug:username>/feed/atom/',
+         feeds.AuthorPostsAtomFeed(),
+         name='profile_atom_feed'),
+    path('search/',
+         views.SearchListView.as_view(),
+         name='search'),
 ]
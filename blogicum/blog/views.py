@@ -1,43 +1,267 @@
-import datetime as dt
+import hashlib
+from functools import wraps
+from http import HTTPStatus
 
+from asgiref.sync import sync_to_async
+from django.conf import settings
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.db.models import Count
+from django.core.cache import cache
+from django.core.handlers.asgi import ASGIRequest
+from django.db import close_old_connections, transaction
+from django.http import Http404, HttpResponse, JsonResponse
 from django.shortcuts import get_object_or_404, redirect
+from django.template.response import TemplateResponse
 from django.views.generic import (
     CreateView,
     DeleteView,
     DetailView,
     ListView,
-    UpdateView
+    UpdateView,
+    View
 )
 from django.urls import reverse
-
+from django.utils.cache import patch_vary_headers
+from django.utils.http import urlencode
+from django.views.decorators.http import condition
+
+from .cache import (
+    GLOBAL_SCOPE,
+    INDEX_SCOPE,
+    category_scope,
+    generations_last_modified,
+    get_generations,
+    page_cache_key,
+    post_scope,
+    profile_scope,
+    record_hit,
+    record_miss
+)
+from .comments import comment_batcher
 from .forms import CommentForm, PostForm, UserForm
-from .models import Post, Category, Comment, User
+from .images import enqueue_variants, mark_image_changed
+from .models import Post, Category, Comment, FeedEntry, User
+from .notifier import publish_comment
+from .paginators import KeysetPaginator
+from .ratelimit import RateLimitMixin
+from .routers import (
+    is_pinned_to_primary,
+    read_from_primary,
+    read_from_replicas
+)
+from .search import search_results
 
 NUMBER_OF_POSTS = 10
+NUMBER_OF_COMMENTS = 50
+POSTS_ORDERING = ('-pub_date', '-id')
+FEED_ORDERING = ('-pub_date', '-post_id')
+COMMENTS_ORDERING = ('created_at', 'id')
 
 
 def output_published(queryset, skip_filter=True):
     queryset = queryset.select_related(
         'category', 'location', 'author'
-    ).annotate(
-        comment_count=Count('comments')
-    ).order_by('-pub_date')
+    ).order_by(*POSTS_ORDERING)
     if not skip_filter:
-        return queryset.filter(
-            is_published=True,
-            category__is_published=True,
-            pub_date__lte=dt.datetime.now()
-        )
+        return queryset.filter(is_visible=True)
     return queryset
 
 
-class ProfileListView(ListView):
+def request_cached(method):
+    """Вычисляет метод представления один раз за запрос.
+
+    Экземпляр представления создаётся на каждый запрос, поэтому результат
+    хранится прямо в нём и не переживает запрос.
+    """
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        cache = self.__dict__.setdefault('_request_cache', {})
+        key = (method.__name__, args, tuple(sorted(kwargs.items())))
+        if key not in cache:
+            cache[key] = method(self, *args, **kwargs)
+        return cache[key]
+    return wrapper
+
+
+def async_view(view_class, **initkwargs):
+    """Асинхронный вариант представления для ASGI.
+
+    В Django 3.2 нет асинхронного ORM, поэтому представление вместе
+    с отрисовкой шаблона выполняется в пуле потоков. С thread_sensitive=False
+    запросы обрабатываются параллельно, а не по очереди в единственном
+    потоке синхронного кода. Соединения с базой в потоках пула
+    закрываются так же, как в начале и конце обычного запроса.
+    """
+    view = view_class.as_view(**initkwargs)
+
+    def render(request, *args, **kwargs):
+        close_old_connections()
+        try:
+            response = view(request, *args, **kwargs)
+            if hasattr(response, 'render'):
+                response.render()
+            return response
+        finally:
+            close_old_connections()
+
+    async def async_view_func(request, *args, **kwargs):
+        return await sync_to_async(render, thread_sensitive=False)(
+            request, *args, **kwargs
+        )
+
+    async_view_func.view_class = view_class
+    return async_view_func
+
+
+def read_view(view_class):
+    if settings.ASYNC_READ_VIEWS:
+        return async_view(view_class)
+    return view_class.as_view()
+
+
+class ReplicaReadMixin:
+    """Читает из реплик, если сессия недавно ничего не записывала.
+
+    Ответ отрисовывается здесь же: запросы из шаблона тоже должны
+    попасть в реплику. Ответ, прочитанный из реплики, помечается
+    атрибутом from_replica.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        if (
+            not settings.DATABASE_REPLICAS
+            or request.method != 'GET'
+            or is_pinned_to_primary(request)
+        ):
+            return super().dispatch(request, *args, **kwargs)
+        with read_from_replicas() as reads:
+            response = super().dispatch(request, *args, **kwargs)
+            if hasattr(response, 'render'):
+                response.render()
+        response.from_replica = reads.used
+        return response
+
+
+class ConditionalPageMixin:
+    """Отвечает 304, пока не сменилось поколение кэша страницы.
+
+    Поколения меняются при каждой правке, видной на странице, поэтому
+    валидаторы вычисляются одним чтением кэша, без запросов к базе.
+    Страница зависит и от зрителя: ETag учитывает куки сессии и CSRF,
+    а Last-Modified, который их не учитывает, отдаётся только без них.
+    Реплика может отставать от поколения, поэтому ответ из неё уходит
+    без валидаторов.
+    """
+
+    def get_cache_scope(self):
+        raise NotImplementedError
+
+    def get_viewer(self, request):
+        return [
+            request.COOKIES.get(name, '')
+            for name in (settings.SESSION_COOKIE_NAME,
+                         settings.CSRF_COOKIE_NAME)
+        ]
+
+    @request_cached
+    def get_page_generations(self):
+        return get_generations(GLOBAL_SCOPE, self.get_cache_scope())
+
+    def get_etag(self, request, *args, **kwargs):
+        version = ':'.join(map(str, [
+            *self.get_page_generations(), *self.get_viewer(request)
+        ]))
+        return hashlib.md5(version.encode()).hexdigest()
+
+    def get_last_modified(self, request, *args, **kwargs):
+        if any(self.get_viewer(request)):
+            return None
+        return generations_last_modified(self.get_page_generations())
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            return super().dispatch(request, *args, **kwargs)
+        response = condition(
+            etag_func=self.get_etag,
+            last_modified_func=self.get_last_modified
+        )(super().dispatch)(request, *args, **kwargs)
+        if getattr(response, 'from_replica', False):
+            for header in ('ETag', 'Last-Modified'):
+                if response.has_header(header):
+                    del response[header]
+        patch_vary_headers(response, ('Cookie',))
+        return response
+
+
+class PostListMixin:
     model = Post
-    template_name = 'blog/profile.html'
     paginate_by = NUMBER_OF_POSTS
+    keyset_ordering = POSTS_ORDERING
+
+    def paginate_queryset(self, queryset, page_size):
+        if not settings.KEYSET_PAGINATION:
+            return super().paginate_queryset(queryset, page_size)
+        paginator = KeysetPaginator(queryset, page_size, self.keyset_ordering)
+        page = paginator.page(self.request.GET.get('cursor'))
+        return paginator, page, page.object_list, page.has_other_pages()
+
+
+class FeedEntryListMixin(PostListMixin):
+    """Лента по таблице FeedEntry.
+
+    Страница выбирается по узкой таблице записей ленты, а публикации
+    для карточек загружаются одним запросом по первичному ключу.
+    """
+
+    context_object_name = 'post_list'
+    keyset_ordering = FEED_ORDERING
+
+    def paginate_queryset(self, queryset, page_size):
+        paginator, page, entries, is_paginated = super().paginate_queryset(
+            queryset.order_by(*FEED_ORDERING), page_size
+        )
+        page.object_list = list(output_published(Post.objects.filter(
+            pk__in=[entry.post_id for entry in entries]
+        )))
+        return paginator, page, page.object_list, is_paginated
+
+
+class AnonymousPageCacheMixin:
+
+    def get_cache_scope(self):
+        raise NotImplementedError
+
+    def dispatch(self, request, *args, **kwargs):
+        if (
+            request.method != 'GET'
+            or request.user.is_authenticated
+            or not settings.FEED_CACHE_TIMEOUT
+        ):
+            return super().dispatch(request, *args, **kwargs)
+        key = page_cache_key(self.get_cache_scope(), request.get_full_path())
+        content = cache.get(key)
+        if content is not None:
+            record_hit()
+            return HttpResponse(content)
+        record_miss()
+        # Страница попадёт в кэш под текущим поколением, поэтому
+        # читается из основной базы, а не из отстающей реплики.
+        with read_from_primary():
+            response = super().dispatch(request, *args, **kwargs)
+            if hasattr(response, 'render'):
+                response.render()
+        if response.status_code == HTTPStatus.OK:
+            cache.set(key, response.content, settings.FEED_CACHE_TIMEOUT)
+        return response
+
+
+class ProfileListView(ConditionalPageMixin, ReplicaReadMixin,
+                      AnonymousPageCacheMixin, PostListMixin, ListView):
+    template_name = 'blog/profile.html'
 
+    def get_cache_scope(self):
+        return profile_scope(self.kwargs['username'])
+
+    @request_cached
     def get_author(self):
         return get_object_or_404(
             User, username=self.kwargs['username']
@@ -70,8 +294,22 @@ class ProfileUpdateView(LoginRequiredMixin, UpdateView):
             args=[self.request.user.username])
 
 
-class PostCreateView(LoginRequiredMixin, CreateView):
+class PostImageMixin:
+
+    def form_valid(self, form):
+        image_changed = 'image' in form.changed_data
+        if image_changed:
+            mark_image_changed(form.instance, form.initial.get('image'))
+        response = super().form_valid(form)
+        if image_changed and self.object.image:
+            enqueue_variants(self.object)
+        return response
+
+
+class PostCreateView(LoginRequiredMixin, RateLimitMixin, PostImageMixin,
+                     CreateView):
     model = Post
+    rate_limit_scope = 'post'
     form_class = PostForm
     template_name = 'blog/create.html'
 
@@ -88,14 +326,18 @@ class PostCreateView(LoginRequiredMixin, CreateView):
 
 class PostDispatchMixin:
 
+    @request_cached
+    def get_object(self, queryset=None):
+        return super().get_object(queryset)
+
     def dispatch(self, *args, **kwargs):
         object = self.get_object()
-        if self.request.user != object.author:
+        if self.request.user.id != object.author_id:
             return redirect('blog:post_detail', post_id=object.id)
         return super().dispatch(*args, **kwargs)
 
 
-class PostUpdateView(PostDispatchMixin, UpdateView):
+class PostUpdateView(PostDispatchMixin, PostImageMixin, UpdateView):
     model = Post
     form_class = PostForm
     template_name = 'blog/create.html'
@@ -126,9 +368,10 @@ class PostDeleteView(LoginRequiredMixin, PostDispatchMixin, DeleteView):
         )
 
 
-class CommentCreateView(LoginRequiredMixin, CreateView):
+class CommentCreateView(LoginRequiredMixin, RateLimitMixin, CreateView):
     model = Comment
     form_class = CommentForm
+    rate_limit_scope = 'comment'
 
     def form_valid(self, form):
         form.instance.author = self.request.user
@@ -136,12 +379,26 @@ class CommentCreateView(LoginRequiredMixin, CreateView):
             Post,
             pk=self.kwargs['post_id']
         )
-        return super().form_valid(form)
+        # Под ASGI синхронные представления выполняются в одном потоке:
+        # к пачке никто не присоединится, и запрос зря прождал бы delay.
+        if settings.COMMENT_COALESCING and not isinstance(
+            self.request, ASGIRequest
+        ):
+            self.object = comment_batcher.add(
+                form.instance,
+                settings.COMMENT_COALESCE_SIZE,
+                settings.COMMENT_COALESCE_DELAY
+            )
+            return redirect(self.get_success_url())
+        response = super().form_valid(form)
+        comment = self.object
+        transaction.on_commit(lambda: publish_comment(comment))
+        return response
 
     def get_success_url(self):
         return reverse(
             'blog:post_detail',
-            args=[self.object.post.id]
+            args=[self.object.post_id]
         )
 
 
@@ -150,6 +407,7 @@ class CommentMixin:
     form_class = CommentForm
     template_name = 'blog/comment.html'
 
+    @request_cached
     def get_object(self, **kwargs):
         return get_object_or_404(
             Comment,
@@ -159,53 +417,115 @@ class CommentMixin:
     def get_success_url(self):
         return reverse(
             'blog:post_detail',
-            args=[self.object.post.id]
+            args=[self.object.post_id]
         )
 
 
-class CommentUpdateView(CommentMixin, LoginRequiredMixin, UpdateView):
-    pass
+class CommentUpdateView(CommentMixin, LoginRequiredMixin, RateLimitMixin,
+                        UpdateView):
+    rate_limit_scope = 'comment'
 
 
 class CommentDeleteView(CommentMixin, LoginRequiredMixin, DeleteView):
     pass
 
 
-class IndexListView(ListView):
-    model = Post
+class IndexListView(ConditionalPageMixin, ReplicaReadMixin,
+                    AnonymousPageCacheMixin, FeedEntryListMixin, ListView):
     template_name = 'blog/index.html'
-    paginate_by = NUMBER_OF_POSTS
+
+    def get_cache_scope(self):
+        return INDEX_SCOPE
 
     def get_queryset(self):
-        return output_published(Post.objects.all(), skip_filter=False)
+        return FeedEntry.objects.all()
 
 
-class PostDetailView(DetailView):
+class PostDetailView(ConditionalPageMixin, ReplicaReadMixin, DetailView):
     model = Post
     template_name = 'blog/detail.html'
     pk_url_kwarg = 'post_id'
 
+    def get_cache_scope(self):
+        return post_scope(self.kwargs['post_id'])
+
     def get_context_data(self, **kwargs):
+        comments = KeysetPaginator(
+            self.object.comments.select_related('author'),
+            NUMBER_OF_COMMENTS,
+            COMMENTS_ORDERING
+        ).page(self.request.GET.get('comments_cursor'))
         return dict(
             **super().get_context_data(**kwargs),
             form=CommentForm(),
-            comments=Comment.objects.select_related('post')
+            comments=comments
         )
 
+    def get_object(self, queryset=None):
+        post = super().get_object(queryset)
+        if post.author_id != self.request.user.id and not post.is_visible:
+            raise Http404('Публикация не найдена.')
+        return post
+
     def get_queryset(self):
-        return output_published(
-            Post.objects.all(),
-            not self.request.user != get_object_or_404(
-                Post, pk=self.kwargs[self.pk_url_kwarg]
-            ).author
-        ).prefetch_related('comments')
+        return output_published(Post.objects.all())
 
 
-class CategoryListView(ListView):
-    model = Post
+class CommentThreadView(ReplicaReadMixin, View):
+    """Окно комментариев после курсора after: HTML-фрагмент или JSON.
+
+    Курсор для следующего запроса приходит в заголовке X-Comments-After;
+    когда обсуждение прочитано до конца, по нему же дозапрашиваются
+    новые комментарии.
+    """
+
+    def get(self, request, post_id):
+        post = get_object_or_404(
+            Post.objects.only('author_id', 'is_visible'), pk=post_id
+        )
+        if post.author_id != request.user.id and not post.is_visible:
+            raise Http404('Публикация не найдена.')
+        cursor = request.GET.get('after')
+        comments = KeysetPaginator(
+            post.comments.select_related('author'),
+            NUMBER_OF_COMMENTS,
+            COMMENTS_ORDERING
+        ).page(cursor)
+        after = comments.end_cursor or cursor or ''
+        if request.GET.get('format') == 'json':
+            response = JsonResponse({
+                'comments': [
+                    {
+                        'id': comment.id,
+                        'author': comment.author.username,
+                        'text': comment.text,
+                        'created_at': comment.created_at,
+                    }
+                    for comment in comments
+                ],
+                'after': after,
+                'has_next': comments.has_next(),
+            })
+        else:
+            response = TemplateResponse(
+                request,
+                'includes/comment_list.html',
+                {'post': post, 'comments': comments}
+            )
+        response['X-Comments-After'] = after
+        response['X-Comments-Has-Next'] = int(comments.has_next())
+        return response
+
+
+class CategoryListView(ConditionalPageMixin, ReplicaReadMixin,
+                       AnonymousPageCacheMixin, FeedEntryListMixin,
+                       ListView):
     template_name = 'blog/category.html'
-    paginate_by = NUMBER_OF_POSTS
 
+    def get_cache_scope(self):
+        return category_scope(self.kwargs['category_slug'])
+
+    @request_cached
     def get_category(self):
         return get_object_or_404(
             Category,
@@ -220,7 +540,41 @@ class CategoryListView(ListView):
         )
 
     def get_queryset(self):
-        return output_published(
-            self.get_category().posts.all(),
-            skip_filter=False
+        return self.get_category().feed_entries.all()
+
+
+class SearchListView(ReplicaReadMixin, ListView):
+    """Выдача поиска страницами по курсору.
+
+    Общее число совпадений не считается: COUNT по индексу стоит почти
+    столько же, сколько сам поиск.
+    """
+
+    model = Post
+    paginate_by = NUMBER_OF_POSTS
+    template_name = 'blog/search.html'
+
+    def get_search_query(self):
+        return self.request.GET.get('q', '').strip()
+
+    def get_context_data(self, **kwargs):
+        query = self.get_search_query()
+        return dict(
+            **super().get_context_data(**kwargs),
+            query=query,
+            page_query=urlencode({'q': query}) + '&'
+        )
+
+    def get_queryset(self):
+        results, self.search_ordering = search_results(
+            self.get_search_query()
         )
+        return results
+
+    def paginate_queryset(self, queryset, page_size):
+        paginator = KeysetPaginator(queryset, page_size, self.search_ordering)
+        page = paginator.page(self.request.GET.get('cursor'))
+        ids = [row.pk for row in page.object_list]
+        posts = output_published(Post.objects.all()).in_bulk(ids)
+        page.object_list = [posts[pk] for pk in ids if pk in posts]
+        return paginator, page, page.object_list, page.has_other_pages()
@@ -14,3 +14,8 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'blogicum.settings')
 
 application = get_asgi_application()
+
+# Импорт моделей возможен только после настройки Django.
+from blog.streams import CommentStreamRouter  # noqa: E402
+
+application = CommentStreamRouter(application)
@@ -0,0 +1,21 @@
+"""Настройки выбираются переменной окружения BLOGICUM_ENV: dev или prod.
+
+Модуль окружения можно указать и напрямую, например,
+DJANGO_SETTINGS_MODULE=blogicum.settings.prod.
+"""
+
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+
+ENVIRONMENT = os.getenv('BLOGICUM_ENV', 'dev')
+
+if ENVIRONMENT == 'dev':
+    from .dev import *  # noqa: F401,F403
+elif ENVIRONMENT == 'prod':
+    from .prod import *  # noqa: F401,F403
+else:
+    raise ImproperlyConfigured(
+        f'Неизвестное окружение BLOGICUM_ENV={ENVIRONMENT!r}: '
+        'ожидается dev или prod.'
+    )
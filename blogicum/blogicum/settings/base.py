@@ -0,0 +1,217 @@
+"""
+Django settings for blogicum project.
+
+Generated by 'django-admin startproject' using Django 3.2.16.
+Общие настройки окружений; dev.py и prod.py дополняют их.
+
+For more information on this file, see
+https://docs.djangoproject.com/en/3.2/topics/settings/
+
+For the full list of settings and their values, see
+https://docs.djangoproject.com/en/3.2/ref/settings/
+"""
+
+import os
+from pathlib import Path
+
+# Build paths inside the project like this: BASE_DIR / 'subdir'.
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+
+
+# Quick-start development settings - unsuitable for production
+# See https://docs.djangoproject.com/en/3.2/howto/deployment/checklist/
+
+# SECURITY WARNING: keep the secret key used in production secret!
+SECRET_KEY = os.getenv(
+    'DJANGO_SECRET_KEY',
+    'django-insecure-!um=+30*0h6n&h1@1)t)%lds55^k)(38_!de2cfm%g1*x-*@3b'
+)
+
+# SECURITY WARNING: don't run with debug turned on in production!
+DEBUG = False
+
+ALLOWED_HOSTS = [
+    'localhost',
+    '127.0.0.1',
+]
+
+
+# Application definition
+STATICFILES_DIRS = [
+    BASE_DIR / 'static_dev',
+]
+
+INSTALLED_APPS = [
+    'pages.apps.PagesConfig',
+    'blog.apps.BlogConfig',
+    'django_bootstrap5',
+    'django.contrib.admin',
+    'django.contrib.auth',
+    'django.contrib.contenttypes',
+    'django.contrib.sessions',
+    'django.contrib.messages',
+    'django.contrib.staticfiles',
+]
+
+MIDDLEWARE = [
+    'django.middleware.security.SecurityMiddleware',
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.middleware.common.CommonMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'blog.middleware.PrimaryStickinessMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+]
+
+ROOT_URLCONF = 'blogicum.urls'
+
+TEMPLATES_DIR = BASE_DIR / 'templates'
+
+TEMPLATES = [
+    {
+        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'DIRS': [TEMPLATES_DIR],
+        'APP_DIRS': True,
+        'OPTIONS': {
+            'context_processors': [
+                'django.template.context_processors.debug',
+                'django.template.context_processors.request',
+                'django.contrib.auth.context_processors.auth',
+                'django.contrib.messages.context_processors.messages',
+            ],
+        },
+    },
+]
+
+WSGI_APPLICATION = 'blogicum.wsgi.application'
+
+
+# Database
+# https://docs.djangoproject.com/en/3.2/ref/settings/#databases
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'db.sqlite3',
+    }
+}
+
+# Реплики только для чтения: в DB_REPLICAS через запятую перечисляются
+# файлы SQLite, которые обновляет команда sync_replica. В тестах реплики
+# совпадают с основной базой.
+DATABASE_REPLICAS = []
+for number, name in enumerate(
+    filter(None, os.getenv('DB_REPLICAS', '').split(',')), start=1
+):
+    DATABASES[f'replica_{number}'] = {
+        **DATABASES['default'],
+        'NAME': name,
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICAS.append(f'replica_{number}')
+
+DATABASE_ROUTERS = ['blog.routers.ReplicaRouter']
+
+# Сколько секунд после записи сессия читает только из основной базы.
+REPLICA_STICKY_SECONDS = 10
+
+# PRAGMA для каждого нового соединения с SQLite. В режиме WAL чтение
+# не ждёт записи, а busy_timeout заставляет ждать освобождения базы
+# вместо немедленной ошибки «database is locked».
+SQLITE_PRAGMAS = {
+    'journal_mode': 'wal',
+    'synchronous': 'normal',
+    'busy_timeout': 5000,
+    # Отрицательное значение — размер в КиБ, а не в страницах.
+    'cache_size': -20000,
+    'mmap_size': 128 * 1024 * 1024,
+}
+
+
+# Password validation
+# https://docs.djangoproject.com/en/3.2/ref/settings/#auth-password-validators
+
+AUTH_PASSWORD_VALIDATORS = [
+    {
+        'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.CommonPasswordValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.NumericPasswordValidator',
+    },
+]
+
+
+# Internationalization
+# https://docs.djangoproject.com/en/3.2/topics/i18n/
+
+LANGUAGE_CODE = 'ru-RU'
+
+TIME_ZONE = 'UTC'
+
+USE_I18N = True
+
+USE_L10N = True
+
+USE_TZ = True
+
+
+# Static files (CSS, JavaScript, Images)
+# https://docs.djangoproject.com/en/3.2/howto/static-files/
+
+STATIC_URL = '/static/'
+
+# Default primary key field type
+# https://docs.djangoproject.com/en/3.2/ref/settings/#default-auto-field
+
+DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+CSRF_FAILURE_VIEW = 'pages.views.csrf_failure'
+
+MEDIA_ROOT = BASE_DIR / 'media'
+
+EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
+EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
+
+LOGIN_REDIRECT_URL = 'blog:index'
+
+LOGIN_URL = 'login'
+
+# Keyset-пагинация лент по (pub_date, id) вместо OFFSET и COUNT:
+# глубокие страницы открываются так же быстро, как первая.
+KEYSET_PAGINATION = False
+
+# Время жизни страниц лент в кэше для анонимных посетителей, секунды;
+# 0 отключает кэширование. Страницы сбрасываются сигналами при изменениях.
+FEED_CACHE_TIMEOUT = 60 * 15
+
+# Компилировать все шаблоны при запуске: ошибки в них обнаружатся сразу,
+# а кэширующий загрузчик не будет разбирать шаблоны на первых запросах.
+PRECOMPILE_TEMPLATES = False
+
+# Асинхронные варианты читающих представлений (лента, категория, профиль,
+# публикация) включаются только явно, BLOGICUM_ASYNC_VIEWS=1: под нагрузкой
+# они отвечали медленнее синхронных.
+ASYNC_READ_VIEWS = os.getenv('BLOGICUM_ASYNC_VIEWS') == '1'
+
+# Ограничение частоты записей корзиной жетонов на пользователя (анонимов —
+# на IP): burst — запас жетонов, per_minute — скорость пополнения.
+# Пустой словарь или отсутствие области отключают ограничение.
+RATE_LIMITS = {
+    'comment': {'burst': 10, 'per_minute': 6},
+    'post': {'burst': 5, 'per_minute': 2},
+}
+
+# Групповая запись комментариев: параллельные запросы ждут до
+# COMMENT_COALESCE_DELAY секунд и записываются одной транзакцией
+# пачками до COMMENT_COALESCE_SIZE штук. Работает только под
+# многопоточным WSGI-сервером; запросы через ASGI пишутся сразу.
+COMMENT_COALESCING = False
+COMMENT_COALESCE_SIZE = 50
+COMMENT_COALESCE_DELAY = 0.02
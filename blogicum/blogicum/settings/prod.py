@@ -0,0 +1,77 @@
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+
+from .base import *  # noqa: F401,F403
+from .base import BASE_DIR, DATABASES, MIDDLEWARE, TEMPLATES
+
+DEBUG = False
+
+SECRET_KEY = os.getenv('DJANGO_SECRET_KEY')
+if not SECRET_KEY:
+    raise ImproperlyConfigured('Задайте переменную DJANGO_SECRET_KEY.')
+
+ALLOWED_HOSTS = os.getenv('ALLOWED_HOSTS', 'localhost,127.0.0.1').split(',')
+
+# Соединения с базами переиспользуются запросами одного процесса.
+DATABASES = {
+    alias: {
+        **config,
+        'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', 600)),
+    }
+    for alias, config in DATABASES.items()
+}
+
+# Кэш должен быть общим для всех процессов: поколения лент, меняемые
+# сигналами в одном процессе, должны видеть и остальные.
+if os.getenv('MEMCACHED_LOCATION'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.memcached.PyMemcacheCache',
+            'LOCATION': os.getenv('MEMCACHED_LOCATION').split(','),
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.getenv('CACHE_DIR', BASE_DIR / 'cache'),
+            'OPTIONS': {'MAX_ENTRIES': 10000},
+        }
+    }
+
+# GZip — первым, чтобы сжимать окончательный ответ; условный GET отвечает
+# 304 по ETag и Last-Modified.
+MIDDLEWARE = [
+    'django.middleware.gzip.GZipMiddleware',
+    *MIDDLEWARE[:1],
+    'django.middleware.http.ConditionalGetMiddleware',
+    *MIDDLEWARE[1:],
+]
+
+# Шаблоны разбираются один раз на процесс. Кэширующий загрузчик
+# не совместим с APP_DIRS, поэтому загрузчики перечислены явно.
+TEMPLATES = [
+    {
+        **TEMPLATES[0],
+        'APP_DIRS': False,
+        'OPTIONS': {
+            **TEMPLATES[0]['OPTIONS'],
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
+            ],
+        },
+    },
+]
+
+PRECOMPILE_TEMPLATES = True
+
+# Файлы статики с хешем содержимого в имени можно кэшировать навсегда;
+# перед запуском выполните collectstatic.
+STATIC_ROOT = BASE_DIR / 'static'
+STATICFILES_STORAGE = (
+    'django.contrib.staticfiles.storage.ManifestStaticFilesStorage'
+)
@@ -0,0 +1,72 @@
+// Дозагрузка обсуждения: «Показать ещё» добавляет следующее окно
+// комментариев на страницу, а прочитанное до конца обсуждение
+// дозапрашивает новые комментарии по событиям из потока SSE или,
+// если поток недоступен (например, под WSGI), периодически.
+(function () {
+  const POLL_INTERVAL = 30000;
+  const thread = document.getElementById('comments');
+  if (!thread) {
+    return;
+  }
+  const more = document.querySelector('[data-comments-more]');
+  let loading = false;
+  let pending = false;
+  let streaming = false;
+
+  async function load() {
+    if (loading) {
+      // Событие пришло во время загрузки: дочитаем после неё.
+      pending = true;
+      return;
+    }
+    loading = true;
+    try {
+      const url = new URL(thread.dataset.url, window.location.href);
+      if (thread.dataset.after) {
+        url.searchParams.set('after', thread.dataset.after);
+      }
+      const response = await fetch(url);
+      if (!response.ok) {
+        return;
+      }
+      thread.insertAdjacentHTML('beforeend', await response.text());
+      thread.dataset.after = response.headers.get('X-Comments-After');
+      thread.dataset.hasNext = response.headers.get('X-Comments-Has-Next');
+      if (more && thread.dataset.hasNext !== '1') {
+        more.closest('li').hidden = true;
+      }
+    } finally {
+      loading = false;
+    }
+    if (pending) {
+      pending = false;
+      load();
+    }
+  }
+
+  if (more) {
+    more.addEventListener('click', function (event) {
+      event.preventDefault();
+      load();
+    });
+  }
+  if (window.EventSource && thread.dataset.streamUrl) {
+    const source = new EventSource(thread.dataset.streamUrl);
+    source.addEventListener('open', function () {
+      streaming = true;
+    });
+    source.addEventListener('error', function () {
+      streaming = source.readyState === EventSource.OPEN;
+    });
+    source.addEventListener('comment', function () {
+      if (thread.dataset.hasNext !== '1') {
+        load();
+      }
+    });
+  }
+  setInterval(function () {
+    if (!streaming && thread.dataset.hasNext !== '1' && !document.hidden) {
+      load();
+    }
+  }, POLL_INTERVAL);
+})();
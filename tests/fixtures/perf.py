@@ -0,0 +1,119 @@
+import io
+import json
+import os
+import random
+from datetime import timedelta
+from pathlib import Path
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.utils import timezone
+from mixer.backend.django import mixer
+
+PERF_USERS = int(os.getenv("PERF_USERS", 50))
+PERF_POSTS = int(os.getenv("PERF_POSTS", 2000))
+PERF_COMMENTS = int(os.getenv("PERF_COMMENTS", 6000))
+PERF_REPEAT = int(os.getenv("PERF_REPEAT", 20))
+PERF_UPDATE_BASELINE = bool(os.getenv("PERF_UPDATE_BASELINE"))
+# Время ответа зависит от машины, поэтому по умолчанию проверяется только
+# число запросов; бюджеты времени включает PERF_TIMINGS=1.
+PERF_TIMINGS = bool(os.getenv("PERF_TIMINGS")) or PERF_UPDATE_BASELINE
+
+BUDGET_PATH = Path(__file__).resolve().parent.parent / "perf_budget.json"
+
+
+def _bulk_blend(model, count, **kwargs):
+    with mixer.ctx(commit=False):
+        items = mixer.cycle(count).blend(model, **kwargs)
+    return type(items[0]).objects.bulk_create(items, batch_size=500)
+
+
+def seed_perf_dataset():
+    """Наполняет базу публикациями и комментариями, похожими на боевые.
+
+    Авторы и посты выбираются с перекосом: у немногих авторов большая часть
+    публикаций, у немногих постов большая часть комментариев.
+    """
+    rnd = random.Random(20231025)
+    now = timezone.now()
+    users = mixer.cycle(PERF_USERS).blend(get_user_model())
+    categories = mixer.cycle(10).blend(
+        "blog.Category", is_published=mixer.sequence(*[True] * 9 + [False])
+    )
+    locations = mixer.cycle(20).blend("blog.Location", is_published=True)
+    authors = rnd.choices(
+        users, weights=[1 / (i + 1) for i in range(len(users))],
+        k=PERF_POSTS
+    )
+    posts = _bulk_blend(
+        "blog.Post",
+        PERF_POSTS,
+        author=mixer.sequence(*authors),
+        category=mixer.sequence(
+            *rnd.choices(categories, k=PERF_POSTS)
+        ),
+        location=mixer.sequence(*rnd.choices(locations, k=PERF_POSTS)),
+        is_published=mixer.sequence(
+            *(rnd.random() > 0.05 for _ in range(PERF_POSTS))
+        ),
+        pub_date=mixer.sequence(*(
+            now - timedelta(minutes=rnd.randint(-60 * 24, 60 * 24 * 365))
+            for _ in range(PERF_POSTS)
+        )),
+        image="",
+    )
+    posts = list(type(posts[0]).objects.order_by("pk"))
+    commented = rnd.choices(
+        posts, weights=[1 / (i + 1) for i in range(len(posts))],
+        k=PERF_COMMENTS
+    )
+    _bulk_blend(
+        "blog.Comment",
+        PERF_COMMENTS,
+        post=mixer.sequence(*commented),
+        author=mixer.sequence(*rnd.choices(users, k=PERF_COMMENTS)),
+    )
+    call_command("recount_comments", stdout=io.StringIO())
+    call_command("publish_scheduled", once=True, stdout=io.StringIO())
+
+    post = type(posts[0]).objects.filter(is_visible=True).order_by(
+        "-comment_count"
+    ).first()
+    comment = mixer.blend("blog.Comment", post=post, author=post.author)
+    return {
+        "user": post.author,
+        "post_id": post.id,
+        "comment_id": comment.id,
+        "username": post.author.username,
+        "category_slug": post.category.slug,
+        "search_term": post.title.split()[0],
+    }
+
+
+def load_budget():
+    with open(BUDGET_PATH, encoding="utf-8") as fh:
+        return json.load(fh)
+
+
+@pytest.fixture(scope="module")
+def perf_dataset(django_db_setup, django_db_blocker):
+    from blog.models import Category, Location
+
+    with django_db_blocker.unblock():
+        dataset = seed_perf_dataset()
+        yield dataset
+        get_user_model().objects.all().delete()
+        Category.objects.all().delete()
+        Location.objects.all().delete()
+
+
+@pytest.fixture(scope="module")
+def perf_measurements():
+    measurements = {}
+    yield measurements
+    if PERF_UPDATE_BASELINE and measurements:
+        with open(BUDGET_PATH, "w", encoding="utf-8") as fh:
+            json.dump(measurements, fh, ensure_ascii=False, indent=2,
+                      sort_keys=True)
+            fh.write("\n")
@@ -0,0 +1,61 @@
+import asyncio
+from http import HTTPStatus
+
+import pytest
+from django.contrib.auth.models import AnonymousUser
+from django.contrib.sessions.backends.db import SessionStore
+from django.http import Http404
+from django.test import AsyncRequestFactory, override_settings
+
+from blog import views
+
+# Потоки пула работают со своими соединениями: данным теста нужна фиксация.
+pytestmark = [pytest.mark.django_db(transaction=True)]
+
+
+def call(view_class, user=None, **kwargs):
+    request = AsyncRequestFactory().get("/")
+    request.user = user or AnonymousUser()
+    request.session = SessionStore()
+    return asyncio.run(views.async_view(view_class)(request, **kwargs))
+
+
+def test_async_read_views(user, post_with_published_location):
+    post = post_with_published_location
+    for view_class, kwargs in (
+        (views.IndexListView, {}),
+        (views.CategoryListView, {"category_slug": post.category.slug}),
+        (views.ProfileListView, {"username": user.username}),
+        (views.PostDetailView, {"post_id": post.id}),
+    ):
+        response = call(view_class, **kwargs)
+        assert response.status_code == HTTPStatus.OK
+        assert post.title in response.content.decode("utf-8"), (
+            f"Убедитесь, что асинхронный вариант {view_class.__name__}"
+            " показывает публикации."
+        )
+
+
+def test_async_detail_respects_visibility(mixer, user, published_category):
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=False
+    )
+    with pytest.raises(Http404):
+        call(views.PostDetailView, post_id=post.id)
+    assert call(
+        views.PostDetailView, user=user, post_id=post.id
+    ).status_code == HTTPStatus.OK
+
+
+def test_read_view_follows_setting():
+    assert not asyncio.iscoroutinefunction(
+        views.read_view(views.IndexListView)
+    )
+    with override_settings(ASYNC_READ_VIEWS=True):
+        view = views.read_view(views.IndexListView)
+    assert asyncio.iscoroutinefunction(view), (
+        "Убедитесь, что с ASYNC_READ_VIEWS читающие представления"
+        " асинхронные."
+    )
+    assert view.view_class is views.IndexListView
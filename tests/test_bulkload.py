@@ -0,0 +1,81 @@
+import io
+import json
+
+import pytest
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db.models import F, Sum
+
+from blog.bulkload import iter_json_array
+from blog.models import Comment, FeedEntry, Post
+from blog.search import search_posts
+
+pytestmark = [pytest.mark.django_db]
+
+DB_JSON = settings.BASE_DIR.parent / "db.json"
+
+
+def test_iter_json_array_streams_items():
+    items = [{"pk": index, "text": "]},{" * index} for index in range(50)]
+    stream = io.StringIO(json.dumps(items, ensure_ascii=False, indent=2))
+    assert list(iter_json_array(stream, chunk_size=7)) == items, (
+        "Убедитесь, что iter_json_array читает массив объектов по частям."
+    )
+    with pytest.raises(ValueError):
+        list(iter_json_array(io.StringIO('[{"pk": 1}, {"pk"'), chunk_size=4))
+
+
+def test_load_fixture_loads_db_json():
+    expected = json.loads(DB_JSON.read_text(encoding="utf-8"))
+    posts = {item["pk"]: item for item in expected
+             if item["model"] == "blog.post"}
+    call_command("load_fixture", str(DB_JSON), batch_size=10,
+                 stdout=io.StringIO())
+    assert Post.objects.count() == len(posts), (
+        "Убедитесь, что команда load_fixture загружает все публикации."
+    )
+    post = Post.objects.get(pk=1)
+    assert post.created_at.isoformat().startswith(
+        posts[1]["fields"]["created_at"][:19]
+    ), "Убедитесь, что load_fixture сохраняет время создания из фикстуры."
+    assert FeedEntry.objects.count() == Post.objects.filter(
+        is_visible=True
+    ).count() > 0, (
+        "Убедитесь, что после load_fixture пересчитываются видимость "
+        "публикаций и таблица ленты."
+    )
+    assert search_posts(Post.objects.all(), post.title).filter(
+        pk=post.pk
+    ).exists(), "Убедитесь, что после load_fixture работает поиск."
+
+    call_command("load_fixture", str(DB_JSON), stdout=io.StringIO())
+    assert Post.objects.count() == len(posts), (
+        "Убедитесь, что повторная загрузка фикстуры обновляет записи, "
+        "а не дублирует их."
+    )
+
+
+def test_generate_data_builds_consistent_dataset():
+    call_command(
+        "generate_data", users=20, categories=4, locations=5, posts=300,
+        comments=900, batch_size=100, stdout=io.StringIO()
+    )
+    assert get_user_model().objects.count() == 20
+    assert Post.objects.count() == 300
+    assert Comment.objects.count() == 900
+    assert Post.objects.aggregate(total=Sum("comment_count"))["total"] == (
+        900
+    ), "Убедитесь, что generate_data пересчитывает счётчики комментариев."
+    assert FeedEntry.objects.count() == Post.objects.filter(
+        is_visible=True
+    ).count(), "Убедитесь, что generate_data заполняет таблицу ленты."
+    assert Post.objects.filter(is_visible=False).exists(), (
+        "Убедитесь, что часть публикаций скрыта или отложена."
+    )
+    assert not Comment.objects.filter(
+        created_at__lt=F("post__pub_date")
+    ).exists(), "Убедитесь, что комментарии появляются после публикации."
+    assert Post._meta.get_field("created_at").auto_now_add, (
+        "Убедитесь, что после загрузки поля auto_now_add восстановлены."
+    )
@@ -0,0 +1,57 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog.models import FeedEntry, Post
+from blog.publishing import set_categories_published
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def categories_with_posts(mixer, user):
+    categories = mixer.cycle(2).blend("blog.Category", is_published=True)
+    for category in categories:
+        mixer.cycle(5).blend(
+            "blog.Post", author=user, category=category, is_published=True
+        )
+    return categories
+
+
+def test_set_categories_published(categories_with_posts, client):
+    ids = [category.id for category in categories_with_posts]
+    client.get("/")
+
+    with CaptureQueriesContext(connection) as hide_queries:
+        assert set_categories_published(ids, False) == (2, 10), (
+            "Убедитесь, что сервис возвращает число изменённых категорий"
+            " и затронутых публикаций."
+        )
+    assert not Post.objects.filter(is_visible=True).exists()
+    assert not FeedEntry.objects.exists()
+    assert set_categories_published(ids, False) == (0, 0)
+    assert "page_obj" in client.get("/").context, (
+        "Убедитесь, что смена видимости категорий сбрасывает кэш лент."
+    )
+
+    with CaptureQueriesContext(connection) as publish_queries:
+        assert set_categories_published(ids, True, batch_size=4) == (2, 10)
+    assert FeedEntry.objects.count() == 10
+    assert len(hide_queries) <= 6, (
+        "Убедитесь, что скрытие категорий не делает запросов на каждую"
+        " публикацию."
+    )
+    assert len(publish_queries) <= 6 + 4 * 4
+
+
+def test_admin_category_actions(admin_client, categories_with_posts):
+    category = categories_with_posts[0]
+    response = admin_client.post(
+        "/admin/blog/category/",
+        {"action": "unpublish_categories", "_selected_action": [category.id]},
+        follow=True,
+    )
+    assert "Изменено категорий: 1, публикаций затронуто: 5." in (
+        response.content.decode("utf-8")
+    )
+    assert FeedEntry.objects.count() == 5
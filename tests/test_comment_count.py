@@ -0,0 +1,61 @@
+from unittest import mock
+
+import pytest
+from django.core.management import call_command
+from django.db import DatabaseError, transaction
+from django.db.models.sql.subqueries import DeleteQuery
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_comment_count_follows_comments(
+    mixer, user_client, user, post_with_published_location
+):
+    post = post_with_published_location
+    comments = mixer.cycle(3).blend("blog.Comment", post=post)
+    post.refresh_from_db()
+    assert post.comment_count == len(comments), (
+        "Убедитесь, что счётчик комментариев увеличивается при их создании."
+    )
+
+    user_client.post(f"/posts/{post.id}/comment/", {"text": "Новый"})
+    post.refresh_from_db()
+    assert post.comment_count == len(comments) + 1
+
+    comments[0].delete()
+    post.refresh_from_db()
+    assert post.comment_count == len(comments), (
+        "Убедитесь, что счётчик комментариев уменьшается при их удалении."
+    )
+
+
+def test_recount_comments_command(mixer, post_with_published_location):
+    post = post_with_published_location
+    mixer.cycle(2).blend("blog.Comment", post=post)
+    type(post).objects.filter(pk=post.pk).update(comment_count=42)
+
+    call_command("recount_comments", batch_size=1)
+
+    post.refresh_from_db()
+    assert post.comment_count == 2, (
+        "Убедитесь, что команда recount_comments восстанавливает счётчик."
+    )
+
+
+def test_failed_post_delete_keeps_comment_count(
+    mixer, post_with_published_location
+):
+    post = post_with_published_location
+    comments = mixer.cycle(2).blend("blog.Comment", post=post)
+    failing_delete = mock.patch.object(
+        DeleteQuery, "delete_batch", side_effect=DatabaseError
+    )
+    with pytest.raises(DatabaseError), transaction.atomic(), failing_delete:
+        post.delete()
+
+    comments[0].delete()
+    post.refresh_from_db()
+    assert post.comment_count == 1, (
+        "Убедитесь, что после неудачного удаления публикации счётчик её"
+        " комментариев продолжает уменьшаться."
+    )
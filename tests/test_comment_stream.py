@@ -0,0 +1,90 @@
+import asyncio
+from http import HTTPStatus
+
+import pytest
+from asgiref.sync import sync_to_async
+
+from blog.notifier import comment_channel, comment_notifier
+
+pytestmark = [pytest.mark.django_db(transaction=True)]
+
+
+def stream_scope(post_id):
+    return {
+        "type": "http",
+        "method": "GET",
+        "path": f"/posts/{post_id}/comments/stream/",
+        "headers": [],
+    }
+
+
+async def open_stream(post_id, until):
+    """Читает поток, пока в нём не появится строка until."""
+    from blogicum.asgi import application
+
+    messages = []
+    disconnected = asyncio.Event()
+
+    async def receive():
+        await disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        messages.append(message)
+        if until.encode() in message.get("body", b""):
+            disconnected.set()
+
+    task = asyncio.ensure_future(
+        application(stream_scope(post_id), receive, send)
+    )
+    return task, messages
+
+
+def body(messages):
+    return b"".join(
+        message.get("body", b"") for message in messages
+    ).decode("utf-8")
+
+
+def test_new_comment_pushed_to_stream(
+    user_client, post_with_published_location
+):
+    post = post_with_published_location
+
+    async def scenario():
+        task, messages = await open_stream(post.id, "Новый комментарий")
+        channel = comment_channel(post.id)
+        while not comment_notifier.subscriber_count(channel):
+            await asyncio.sleep(0.01)
+        await sync_to_async(user_client.post)(
+            f"/posts/{post.id}/comment/", {"text": "Новый комментарий"}
+        )
+        await asyncio.wait_for(task, 5)
+        return messages
+
+    messages = asyncio.run(scenario())
+    assert messages[0]["status"] == HTTPStatus.OK
+    assert (
+        b"content-type", b"text/event-stream; charset=utf-8"
+    ) in messages[0]["headers"]
+    assert "event: comment" in body(messages), (
+        "Убедитесь, что новый комментарий отправляется в поток SSE"
+        " публикации."
+    )
+    assert not comment_notifier.subscriber_count(comment_channel(post.id)), (
+        "Убедитесь, что отключившийся читатель отписывается от событий."
+    )
+
+
+def test_stream_of_hidden_post_not_found(mixer, user, published_category):
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=False
+    )
+
+    async def scenario():
+        task, messages = await open_stream(post.id, "")
+        await asyncio.wait_for(task, 5)
+        return messages
+
+    assert asyncio.run(scenario())[0]["status"] == HTTPStatus.NOT_FOUND
@@ -0,0 +1,77 @@
+from http import HTTPStatus
+
+import pytest
+
+from blog.views import NUMBER_OF_COMMENTS
+
+pytestmark = [pytest.mark.django_db]
+
+
+def get_window(client, post, after=None, **params):
+    if after:
+        params["after"] = after
+    response = client.get(f"/posts/{post.id}/comments/", params)
+    assert response.status_code == HTTPStatus.OK, (
+        "Убедитесь, что окно комментариев `/posts/<post_id>/comments/`"
+        " загружается без ошибок."
+    )
+    return response
+
+
+def test_comment_windows_and_new_comments(
+    mixer, client, django_assert_num_queries, post_with_published_location
+):
+    post = post_with_published_location
+    comments = mixer.cycle(NUMBER_OF_COMMENTS + 5).blend(
+        "blog.Comment", post=post
+    )
+
+    with django_assert_num_queries(2):
+        first = get_window(client, post)
+    assert list(first.context["comments"]) == comments[:NUMBER_OF_COMMENTS]
+    assert first["X-Comments-Has-Next"] == "1"
+
+    rest = get_window(client, post, first["X-Comments-After"])
+    assert list(rest.context["comments"]) == comments[NUMBER_OF_COMMENTS:], (
+        "Убедитесь, что курсор X-Comments-After открывает следующее окно."
+    )
+    assert rest["X-Comments-Has-Next"] == "0"
+
+    after = rest["X-Comments-After"]
+    empty = get_window(client, post, after)
+    assert list(empty.context["comments"]) == []
+    assert empty["X-Comments-After"] == after, (
+        "Убедитесь, что прочитанное до конца обсуждение сохраняет курсор"
+        " для опроса новых комментариев."
+    )
+
+    new = mixer.blend("blog.Comment", post=post, text="Новый комментарий")
+    response = get_window(client, post, after)
+    assert "Новый комментарий" in response.content.decode("utf-8")
+    assert list(response.context["comments"]) == [new]
+
+
+def test_comment_window_json(mixer, client, post_with_published_location):
+    comment = mixer.blend(
+        "blog.Comment", post=post_with_published_location
+    )
+    data = get_window(
+        client, post_with_published_location, format="json"
+    ).json()
+    assert [item["id"] for item in data["comments"]] == [comment.id]
+    assert data["comments"][0]["author"] == comment.author.username
+    assert data["has_next"] is False and data["after"]
+
+
+def test_comment_window_of_hidden_post(
+    mixer, client, user_client, user, published_category
+):
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=False
+    )
+    response = client.get(f"/posts/{post.id}/comments/")
+    assert response.status_code == HTTPStatus.NOT_FOUND, (
+        "Убедитесь, что комментарии скрытой публикации видит только автор."
+    )
+    get_window(user_client, post)
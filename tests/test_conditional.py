@@ -0,0 +1,137 @@
+import time
+from http import HTTPStatus
+from unittest import mock
+
+import pytest
+from django.core.cache import cache
+from django.utils.http import http_date
+
+pytestmark = [pytest.mark.django_db]
+
+
+def revalidate(client, url, response):
+    return client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+
+
+def cache_clock(time_ns, now):
+    return mock.patch(
+        "blog.cache.time", mock.Mock(time_ns=time_ns, time=now)
+    )
+
+
+@pytest.fixture
+def second_passed():
+    """Last-Modified отдаётся, когда секунда поколения уже прошла."""
+    with cache_clock(time.time_ns, lambda: time.time() + 1):
+        yield
+
+
+@pytest.mark.parametrize("url_name", ["index", "category", "profile"])
+def test_feed_revalidated_without_queries(
+    mixer, client, django_assert_num_queries, user, published_category,
+    post_with_published_location, second_passed, url_name
+):
+    url = {
+        "index": "/",
+        "category": f"/category/{published_category.slug}/",
+        "profile": f"/profile/{user.username}/",
+    }[url_name]
+    response = client.get(url)
+    assert response.has_header("ETag") and response.has_header(
+        "Last-Modified"
+    ), "Убедитесь, что страницы лент отдают ETag и Last-Modified."
+
+    with django_assert_num_queries(0):
+        cached = revalidate(client, url, response)
+    assert cached.status_code == HTTPStatus.NOT_MODIFIED, (
+        "Убедитесь, что неизменившаяся лента отвечает 304 без запросов"
+        " к базе."
+    )
+    assert client.get(
+        url, HTTP_IF_MODIFIED_SINCE=response["Last-Modified"]
+    ).status_code == HTTPStatus.NOT_MODIFIED
+
+    mixer.blend("blog.Comment", post=post_with_published_location)
+    assert revalidate(client, url, response).status_code == HTTPStatus.OK, (
+        "Убедитесь, что новый комментарий меняет ETag ленты."
+    )
+
+
+def test_last_modified_changes_within_second(
+    mixer, client, post_with_published_location
+):
+    second = int(time.time()) - 10
+    with cache_clock(lambda: second * 10 ** 9 + 200_000_000,
+                     lambda: second + 0.5):
+        cache.clear()
+        response = client.get("/")
+    assert response.has_header("ETag") and not response.has_header(
+        "Last-Modified"
+    ), (
+        "Убедитесь, что Last-Modified не отдаётся, пока не закончилась"
+        " секунда последнего изменения."
+    )
+
+    with cache_clock(lambda: second * 10 ** 9 + 700_000_000,
+                     lambda: second + 0.8):
+        mixer.blend("blog.Comment", post=post_with_published_location)
+    with cache_clock(time.time_ns, lambda: second + 1.5):
+        response = client.get("/")
+        assert response["Last-Modified"] == http_date(second + 1), (
+            "Убедитесь, что Last-Modified — следующая за изменением секунда."
+        )
+        assert client.get(
+            "/", HTTP_IF_MODIFIED_SINCE=http_date(second)
+        ).status_code == HTTPStatus.OK
+
+
+def test_detail_etag_follows_comment_edits(
+    mixer, client, post_with_published_location
+):
+    post = post_with_published_location
+    comment = mixer.blend("blog.Comment", post=post)
+    url = f"/posts/{post.id}/"
+    response = client.get(url)
+    assert revalidate(client, url, response).status_code == (
+        HTTPStatus.NOT_MODIFIED
+    )
+
+    comment.text = "Исправленный комментарий"
+    comment.save()
+    assert revalidate(client, url, response).status_code == HTTPStatus.OK, (
+        "Убедитесь, что правка комментария меняет ETag страницы публикации."
+    )
+
+
+def test_validators_depend_on_viewer(
+    client, user_client, post_with_published_location
+):
+    anonymous = client.get("/")
+    response = user_client.get("/")
+    assert not response.has_header("Last-Modified"), (
+        "Убедитесь, что Last-Modified не отдаётся страницам, зависящим"
+        " от пользователя."
+    )
+    assert revalidate(user_client, "/", anonymous).status_code == (
+        HTTPStatus.OK
+    ), "Убедитесь, что ETag страницы учитывает вошедшего пользователя."
+    assert revalidate(user_client, "/", response).status_code == (
+        HTTPStatus.NOT_MODIFIED
+    )
+
+
+def test_missing_objects_do_not_pin_generations(client):
+    with mock.patch.object(
+        cache, "set_many", wraps=cache.set_many
+    ) as set_many:
+        for url in ("/category/no-such-category/", "/posts/999999/",
+                    "/profile/no-such-user/"):
+            assert client.get(url).status_code == HTTPStatus.NOT_FOUND
+    timeouts = [
+        call.args[1] if len(call.args) > 1 else call.kwargs.get("timeout")
+        for call in set_many.call_args_list
+    ]
+    assert timeouts and None not in timeouts, (
+        "Убедитесь, что поколения кэша заводятся с ограниченным сроком:"
+        " запросы к несуществующим страницам не должны копить ключи."
+    )
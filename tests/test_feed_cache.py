@@ -0,0 +1,60 @@
+import pytest
+
+from blog.cache import get_stats
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_anonymous_feed_served_from_cache(
+    client, django_assert_num_queries, post_with_published_location
+):
+    post = post_with_published_location
+    first = client.get("/")
+    assert post.title in first.content.decode("utf-8")
+
+    with django_assert_num_queries(0):
+        second = client.get("/")
+    assert second.content == first.content, (
+        "Убедитесь, что повторный запрос ленты анонимом берётся из кэша."
+    )
+    assert get_stats()["hits"] == 1
+
+
+@pytest.mark.parametrize("url_name", ["index", "category", "profile"])
+def test_feed_cache_invalidated_by_signals(
+    mixer, client, user, published_category, published_location,
+    post_with_published_location, url_name
+):
+    url = {
+        "index": "/",
+        "category": f"/category/{published_category.slug}/",
+        "profile": f"/profile/{user.username}/",
+    }[url_name]
+    post = post_with_published_location
+    client.get(url)
+
+    mixer.blend("blog.Comment", post=post)
+    assert "Комментарии (1)" in client.get(url).content.decode("utf-8"), (
+        "Убедитесь, что новый комментарий сбрасывает кэш ленты."
+    )
+
+    published_location.name = "Новое место"
+    published_location.save()
+    assert "Новое место" in client.get(url).content.decode("utf-8"), (
+        "Убедитесь, что изменение местоположения сбрасывает кэш ленты."
+    )
+
+    post.title = "Обновлённый заголовок"
+    post.save()
+    assert "Обновлённый заголовок" in client.get(url).content.decode(
+        "utf-8"
+    ), "Убедитесь, что изменение публикации сбрасывает кэш ленты."
+
+
+def test_authenticated_feed_not_cached(
+    user_client, post_with_published_location
+):
+    user_client.get("/")
+    response = user_client.get("/")
+    assert response.context is not None
+    assert get_stats() == {"hits": 0, "misses": 0, "hit_rate": 0.0}
@@ -0,0 +1,74 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from blog.models import FeedEntry
+
+pytestmark = [pytest.mark.django_db]
+
+
+def entry_ids():
+    return set(FeedEntry.objects.values_list("post_id", flat=True))
+
+
+def test_feed_entry_follows_post(
+    mixer, post_with_published_location, another_category
+):
+    post = post_with_published_location
+    assert entry_ids() == {post.id}, (
+        "Убедитесь, что видимая публикация попадает в таблицу ленты."
+    )
+
+    post.category = another_category
+    post.pub_date -= timedelta(days=1)
+    post.save()
+    entry = FeedEntry.objects.get()
+    assert (entry.category_id, entry.pub_date) == (
+        another_category.id, post.pub_date
+    ), "Убедитесь, что запись ленты обновляется вместе с публикацией."
+
+    post.is_published = False
+    post.save()
+    assert entry_ids() == set(), (
+        "Убедитесь, что скрытая публикация удаляется из таблицы ленты."
+    )
+
+
+def test_feed_entry_follows_schedule_and_category(
+    mixer, user, published_category
+):
+    post = mixer.blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        is_published=True,
+        pub_date=timezone.now() + timedelta(hours=1),
+    )
+    assert entry_ids() == set()
+
+    type(post).objects.filter(pk=post.pk).update(
+        pub_date=timezone.now() - timedelta(minutes=1)
+    )
+    call_command("publish_scheduled", once=True)
+    assert entry_ids() == {post.id}, (
+        "Убедитесь, что наступившая публикация попадает в таблицу ленты."
+    )
+
+    published_category.is_published = False
+    published_category.save()
+    assert entry_ids() == set(), (
+        "Убедитесь, что снятие категории с публикации очищает её ленту."
+    )
+    published_category.is_published = True
+    published_category.save()
+    assert entry_ids() == {post.id}
+
+
+def test_rebuild_feed_restores_entries(post_with_published_location):
+    FeedEntry.objects.all().delete()
+    call_command("rebuild_feed")
+    assert entry_ids() == {post_with_published_location.id}, (
+        "Убедитесь, что команда rebuild_feed восстанавливает таблицу ленты."
+    )
@@ -0,0 +1,151 @@
+from io import BytesIO
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.utils import timezone
+from PIL import Image
+
+from blog.images import (
+    IMAGE_WIDTHS,
+    VARIANT_FORMATS,
+    claim_task,
+    process_task,
+    variant_name
+)
+
+pytestmark = [pytest.mark.django_db]
+
+
+def make_upload(size=(1600, 1200)):
+    image_data = BytesIO()
+    Image.new("RGB", size).save(image_data, "JPEG")
+    return SimpleUploadedFile(
+        "test_image.jpg", image_data.getvalue(), content_type="image/jpeg"
+    )
+
+
+def create_post_with_image(user_client, category):
+    response = user_client.post("/posts/create/", {
+        "title": "Пост с фото",
+        "text": "Текст",
+        "pub_date": "2020-01-01T10:00",
+        "category": category.id,
+        "is_published": True,
+        "image": make_upload(),
+    })
+    assert response.status_code == 302, (
+        "Убедитесь, что публикация с изображением создаётся без ошибок."
+    )
+    from blog.models import Post
+
+    return Post.objects.get(title="Пост с фото")
+
+
+def process_images():
+    call_command("process_images", once=True)
+
+
+def test_variants_generated_by_worker(user_client, published_category):
+    post = create_post_with_image(user_client, published_category)
+    assert post.image_status == post.ImageStatus.PENDING, (
+        "Убедитесь, что копии изображения ставятся в очередь, а не"
+        " создаются во время запроса."
+    )
+    content = user_client.get("/").content.decode("utf-8")
+    assert f'src="{post.image.url}"' in content, (
+        "Убедитесь, что пока копии не готовы, выводится оригинал."
+    )
+
+    process_images()
+    post.refresh_from_db()
+    assert post.image_status == post.ImageStatus.READY
+    storage = post.image.storage
+    for width in IMAGE_WIDTHS:
+        for extension, _, _ in VARIANT_FORMATS:
+            name = variant_name(post.image.name, width, extension)
+            assert storage.exists(name), (
+                f"Убедитесь, что при загрузке создаётся копия `{name}`."
+            )
+            with Image.open(storage.path(name)) as variant:
+                assert variant.width == width
+                assert not variant.getexif()
+
+
+def test_feed_uses_srcset(user_client, published_category):
+    post = create_post_with_image(user_client, published_category)
+    process_images()
+    content = user_client.get("/").content.decode("utf-8")
+    assert "srcset=" in content, (
+        "Убедитесь, что в ленте изображения выводятся с атрибутом srcset."
+    )
+    assert f'src="{post.image.url}"' not in content, (
+        "Убедитесь, что в карточке ленты не выводится оригинал изображения."
+    )
+
+
+def test_failed_task_retried_then_marked(user_client, published_category):
+    from blog.models import ImageTask
+
+    post = create_post_with_image(user_client, published_category)
+    post.image.storage.delete(post.image.name)
+    for _ in range(3):
+        ImageTask.objects.update(run_after=timezone.now())
+        call_command("process_images", once=True, max_attempts=3)
+
+    task = ImageTask.objects.get(post=post)
+    post.refresh_from_db()
+    assert task.status == ImageTask.Status.FAILED
+    assert task.attempts == 3
+    assert task.last_error
+    assert post.image_status == post.ImageStatus.FAILED
+
+
+def variant_names(name):
+    return [
+        variant_name(name, width, extension)
+        for width in IMAGE_WIDTHS
+        for extension, _, _ in VARIANT_FORMATS
+    ]
+
+
+def test_image_replaced_during_processing(user_client, published_category):
+    post = create_post_with_image(user_client, published_category)
+    old_name = post.image.name
+    task = claim_task()
+    # Изображение меняется, пока обработчик делает копии старого.
+    type(post).objects.filter(pk=post.pk).update(
+        image="posts_images/replaced.jpg"
+    )
+    process_task(task)
+    post.refresh_from_db()
+    assert post.image_status == post.ImageStatus.PENDING, (
+        "Убедитесь, что копии заменённого изображения не отмечают"
+        " публикацию готовой."
+    )
+    assert not any(
+        post.image.storage.exists(name) for name in variant_names(old_name)
+    ), "Убедитесь, что копии заменённого изображения удаляются."
+
+
+def test_replaced_image_variants_deleted(
+    user_client, published_category, django_capture_on_commit_callbacks
+):
+    post = create_post_with_image(user_client, published_category)
+    process_images()
+    old_name = post.image.name
+    with django_capture_on_commit_callbacks(execute=True):
+        response = user_client.post(f"/posts/{post.id}/edit/", {
+            "title": post.title,
+            "text": post.text,
+            "pub_date": "2020-01-01T10:00",
+            "category": published_category.id,
+            "is_published": True,
+            "image": make_upload((800, 600)),
+        })
+    assert response.status_code == 302
+    post.refresh_from_db()
+    assert post.image.name != old_name
+    assert not any(
+        post.image.storage.exists(name) for name in variant_names(old_name)
+    ), "Убедитесь, что при замене изображения удаляются копии прежнего."
@@ -0,0 +1,131 @@
+import re
+from datetime import timedelta
+
+import pytest
+from django.test import override_settings
+from django.utils import timezone
+
+from conftest import N_PER_PAGE
+
+pytestmark = [pytest.mark.django_db]
+
+
+def get_page(client, url):
+    response = client.get(url)
+    assert response.status_code == 200, (
+        f"Убедитесь, что страница `{url}` загружается без ошибок."
+    )
+    return response
+
+
+def get_cursor_links(response):
+    content = response.content.decode("utf-8")
+    return re.findall(r'href="\?cursor=([\w-]+)"', content)
+
+
+@override_settings(KEYSET_PAGINATION=True)
+@pytest.mark.parametrize("url_name", ["index", "category", "profile"])
+def test_keyset_pagination(
+    user_client, user, published_category,
+    many_posts_with_published_locations, url_name
+):
+    url = {
+        "index": "/",
+        "category": f"/category/{published_category.slug}/",
+        "profile": f"/profile/{user.username}/",
+    }[url_name]
+    posts = many_posts_with_published_locations
+    expected = sorted(posts, key=lambda p: (p.pub_date, p.id), reverse=True)
+
+    first_page = get_page(user_client, url)
+    first_ids = [post.id for post in first_page.context["page_obj"]]
+    assert first_ids == [post.id for post in expected[:N_PER_PAGE]], (
+        "Убедитесь, что при keyset-пагинации первая страница содержит"
+        " самые новые публикации."
+    )
+    next_cursor = first_page.context["page_obj"].next_cursor
+    assert next_cursor in get_cursor_links(first_page), (
+        "Убедитесь, что в пагинаторе есть ссылка на следующую страницу."
+    )
+
+    second_page = get_page(user_client, f"{url}?cursor={next_cursor}")
+    page_obj = second_page.context["page_obj"]
+    assert [post.id for post in page_obj] == [
+        post.id for post in expected[N_PER_PAGE:2 * N_PER_PAGE]
+    ], "Убедитесь, что курсор ведёт на следующую страницу публикаций."
+    assert not page_obj.has_next()
+
+    back_page = get_page(
+        user_client, f"{url}?cursor={page_obj.previous_cursor}"
+    )
+    assert [post.id for post in back_page.context["page_obj"]] == first_ids
+
+
+@override_settings(KEYSET_PAGINATION=True)
+def test_keyset_pagination_keeps_microseconds(
+    mixer, user_client, user, published_category
+):
+    # Все публикации укладываются в одну миллисекунду: курсор, округлённый
+    # до миллисекунд, потерял бы вторую страницу.
+    base = timezone.now().replace(microsecond=0) - timedelta(days=1)
+    posts = mixer.cycle(N_PER_PAGE * 2).blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        location=None,
+        pub_date=mixer.sequence(*(
+            base + timedelta(microseconds=index * 37)
+            for index in range(N_PER_PAGE * 2)
+        )),
+    )
+    expected = [post.id for post in sorted(
+        posts, key=lambda p: (p.pub_date, p.id), reverse=True
+    )]
+    first_page = get_page(user_client, "/").context["page_obj"]
+    second_page = get_page(
+        user_client, f"/?cursor={first_page.next_cursor}"
+    ).context["page_obj"]
+    assert [post.id for post in first_page] + [
+        post.id for post in second_page
+    ] == expected, (
+        "Убедитесь, что курсор хранит время публикации с точностью до "
+        "микросекунд и страницы не теряют публикации."
+    )
+
+
+@override_settings(KEYSET_PAGINATION=True)
+def test_keyset_pagination_bad_cursor(user_client):
+    response = user_client.get("/?cursor=not-a-cursor")
+    assert response.status_code == 404, (
+        "Убедитесь, что для некорректного курсора возвращается статус 404."
+    )
+
+
+def test_detail_comments_window(
+    mixer, client, django_assert_max_num_queries,
+    post_with_published_location, post_of_another_author
+):
+    from blog.views import NUMBER_OF_COMMENTS
+
+    post = post_with_published_location
+    comments = mixer.cycle(NUMBER_OF_COMMENTS + 5).blend(
+        "blog.Comment", post=post
+    )
+    mixer.blend("blog.Comment", post=post_of_another_author)
+
+    with django_assert_max_num_queries(5):
+        response = get_page(client, f"/posts/{post.id}/")
+    window = response.context["comments"]
+    assert [c.id for c in window] == [
+        c.id for c in comments[:NUMBER_OF_COMMENTS]
+    ], (
+        "Убедитесь, что на странице поста выводится первое окно"
+        " комментариев только этой публикации."
+    )
+
+    rest = get_page(
+        client, f"/posts/{post.id}/?comments_cursor={window.next_cursor}"
+    ).context["comments"]
+    assert [c.id for c in rest] == [
+        c.id for c in comments[NUMBER_OF_COMMENTS:]
+    ], "Убедитесь, что ссылка «Показать ещё» открывает следующее окно."
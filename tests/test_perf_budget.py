@@ -0,0 +1,123 @@
+"""Бюджет числа запросов и времени ответа для каждого маршрута.
+
+Бюджеты хранятся в `perf_budget.json`. Обычный прогон проверяет только
+число SQL-запросов; время ответа проверяется с PERF_TIMINGS=1. Чтобы
+перезаписать бюджеты по результатам текущего прогона, запустите тесты
+с PERF_UPDATE_BASELINE=1.
+"""
+import gc
+import statistics
+import time
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+from fixtures.perf import (
+    PERF_REPEAT,
+    PERF_TIMINGS,
+    PERF_UPDATE_BASELINE,
+    load_budget
+)
+
+pytestmark = [pytest.mark.django_db, pytest.mark.perf]
+
+ROUTES = {
+    "blog:index": ("get", "/"),
+    "blog:edit_profile": ("get", "/profile/edit_profile/"),
+    "blog:profile": ("get", "/profile/{username}/"),
+    "blog:create_post": ("get", "/posts/create/"),
+    "blog:post_detail": ("get", "/posts/{post_id}/"),
+    "blog:comments": ("get", "/posts/{post_id}/comments/"),
+    "blog:add_comment": ("post", "/posts/{post_id}/comment/"),
+    "blog:delete_comment": (
+        "get", "/posts/{post_id}/delete_comment/{comment_id}/"
+    ),
+    "blog:edit_comment": (
+        "get", "/posts/{post_id}/edit_comment/{comment_id}/"
+    ),
+    "blog:delete_post": ("get", "/posts/{post_id}/delete/"),
+    "blog:edit_post": ("get", "/posts/{post_id}/edit/"),
+    "blog:category_posts": ("get", "/category/{category_slug}/"),
+    "blog:search": ("get", "/search/?q={search_term}"),
+    "blog:index_feed": ("get", "/feed/"),
+    "blog:index_atom_feed": ("get", "/feed/atom/"),
+    "blog:category_feed": ("get", "/category/{category_slug}/feed/"),
+    "blog:category_atom_feed": (
+        "get", "/category/{category_slug}/feed/atom/"
+    ),
+    "blog:profile_feed": ("get", "/profile/{username}/feed/"),
+    "blog:profile_atom_feed": ("get", "/profile/{username}/feed/atom/"),
+    "pages:about": ("get", "/pages/about/"),
+    "pages:rules": ("get", "/pages/rules/"),
+}
+
+
+def test_every_route_has_budget():
+    from blog.urls import urlpatterns as blog_urls
+    from pages.urls import urlpatterns as pages_urls
+
+    route_names = {f"blog:{url.name}" for url in blog_urls} | {
+        f"pages:{url.name}" for url in pages_urls
+    }
+    assert route_names == set(ROUTES), (
+        "Добавьте новый маршрут в ROUTES и задайте ему бюджет."
+    )
+    if not PERF_UPDATE_BASELINE:
+        assert route_names == set(load_budget()), (
+            "Задайте бюджет каждого маршрута в `perf_budget.json`."
+        )
+
+
+@pytest.mark.parametrize("route", sorted(ROUTES))
+def test_route_budget(perf_dataset, perf_measurements, settings, route):
+    # Бюджет замеряет сам маршрут: повторные записи не должны упираться
+    # в ограничение частоты.
+    settings.RATE_LIMITS = {}
+    method, url = ROUTES[route]
+    url = url.format(**perf_dataset)
+    client = Client()
+    client.force_login(perf_dataset["user"])
+    request = getattr(client, method)
+    data = {"text": "Комментарий"} if method == "post" else {}
+
+    timings = []
+    # Число запросов берётся по последнему, прогретому обращению. Кэш
+    # страниц и лент перед каждым обращением очищается: иначе бюджет
+    # описывал бы попадание в кэш, а не построение страницы.
+    for _ in range(PERF_REPEAT if PERF_TIMINGS else 2):
+        cache.clear()
+        # Как и timeit, не даём сборщику мусора исказить замер.
+        gc.collect()
+        gc.disable()
+        try:
+            with CaptureQueriesContext(connection) as queries:
+                start = time.perf_counter()
+                response = request(url, data)
+                timings.append((time.perf_counter() - start) * 1000)
+        finally:
+            gc.enable()
+        assert response.status_code in (200, 302), (
+            f"Убедитесь, что страница `{url}` загружается без ошибок."
+        )
+    if PERF_UPDATE_BASELINE:
+        p95 = statistics.quantiles(timings, n=20)[-1]
+        perf_measurements[route] = {
+            "queries": len(queries),
+            "p95_ms": round(p95 * 3 + 50),
+        }
+        return
+    budget = load_budget()[route]
+    assert len(queries) <= budget["queries"], (
+        f"Маршрут {route} выполнил {len(queries)} SQL-запросов,"
+        f" бюджет — {budget['queries']}."
+    )
+    if not PERF_TIMINGS:
+        return
+    p95 = statistics.quantiles(timings, n=20)[-1]
+    assert p95 <= budget["p95_ms"], (
+        f"95-й перцентиль времени ответа {route} — {p95:.1f} мс,"
+        f" бюджет — {budget['p95_ms']} мс."
+    )
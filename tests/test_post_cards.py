@@ -0,0 +1,38 @@
+import pytest
+
+pytestmark = [pytest.mark.django_db]
+
+
+def feed(client):
+    return client.get("/").content.decode("utf-8")
+
+
+def test_post_card_cached_by_version(
+    mixer, user_client, published_category, post_with_published_location
+):
+    post = post_with_published_location
+    assert post.title in feed(user_client)
+
+    type(post).objects.filter(pk=post.pk).update(title="Без сохранения")
+    assert "Без сохранения" not in feed(user_client), (
+        "Убедитесь, что карточка публикации берётся из кэша."
+    )
+
+    post.refresh_from_db()
+    post.title = "Новый заголовок"
+    post.save()
+    assert "Новый заголовок" in feed(user_client), (
+        "Убедитесь, что сохранение публикации меняет ключ её карточки."
+    )
+
+    mixer.blend("blog.Comment", post=post)
+    assert "Комментарии (1)" in feed(user_client), (
+        "Убедитесь, что новый комментарий обновляет карточку."
+    )
+
+    published_category.title = "Новая категория"
+    published_category.save()
+    assert "Новая категория" in feed(user_client), (
+        "Убедитесь, что изменение категории обновляет карточки."
+    )
+
@@ -0,0 +1,68 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def scheduled_post(mixer, user, published_category, published_location):
+    return mixer.blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        location=published_location,
+        is_published=True,
+        pub_date=timezone.now() + timedelta(hours=1),
+    )
+
+
+def test_scheduler_publishes_due_posts(client, scheduled_post):
+    post = scheduled_post
+    assert not post.is_visible
+    assert post.title not in client.get("/").content.decode("utf-8")
+
+    call_command("publish_scheduled", once=True)
+    post.refresh_from_db()
+    assert not post.is_visible, (
+        "Убедитесь, что планировщик не показывает публикации раньше срока."
+    )
+
+    type(post).objects.filter(pk=post.pk).update(
+        pub_date=timezone.now() - timedelta(minutes=1)
+    )
+    assert post.title not in client.get("/").content.decode("utf-8"), (
+        "Убедитесь, что ленты не зависят от текущего времени."
+    )
+    call_command("publish_scheduled", once=True)
+    post.refresh_from_db()
+    assert post.is_visible
+    assert post.title in client.get("/").content.decode("utf-8"), (
+        "Убедитесь, что планировщик сбрасывает кэш лент при публикации."
+    )
+    assert client.get(f"/posts/{post.id}/").status_code == 200
+
+
+def test_category_publication_updates_visibility(
+    published_category, post_with_published_location
+):
+    post = post_with_published_location
+    assert post.is_visible
+
+    published_category.is_published = False
+    published_category.save()
+    post.refresh_from_db()
+    assert not post.is_visible, (
+        "Убедитесь, что снятие категории с публикации скрывает её посты."
+    )
+
+    published_category.is_published = True
+    published_category.save()
+    post.refresh_from_db()
+    assert post.is_visible
+
+    published_category.delete()
+    post.refresh_from_db()
+    assert not post.is_visible
@@ -0,0 +1,71 @@
+"""Число SQL-запросов на каждый маршрут приложения blog.
+
+Запросы сессии и пользователя авторизованного клиента входят в счёт.
+Если число изменилось осознанно, поправьте ожидание в таблице.
+"""
+import pytest
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def objects(mixer, user, published_category, post_with_published_location):
+    post = post_with_published_location
+    comment = mixer.blend("blog.Comment", post=post, author=user)
+    mixer.cycle(3).blend("blog.Comment", post=post)
+    return {
+        "username": user.username,
+        "slug": published_category.slug,
+        "category_id": published_category.id,
+        "post_id": post.id,
+        "comment_id": comment.id,
+    }
+
+
+@pytest.mark.parametrize(
+    ("method", "url", "data", "expected"),
+    [
+        ("get", "/", None, 5),
+        ("get", "/profile/edit_profile/", None, 2),
+        ("get", "/profile/{username}/", None, 5),
+        ("get", "/posts/create/", None, 4),
+        ("get", "/posts/{post_id}/", None, 4),
+        ("post", "/posts/{post_id}/comment/", {"text": "Текст"}, 7),
+        ("get", "/posts/{post_id}/edit_comment/{comment_id}/", None, 3),
+        (
+            "post", "/posts/{post_id}/edit_comment/{comment_id}/",
+            {"text": "Текст"}, 4
+        ),
+        ("get", "/posts/{post_id}/delete_comment/{comment_id}/", None, 3),
+        ("post", "/posts/{post_id}/delete_comment/{comment_id}/", None, 8),
+        ("get", "/posts/{post_id}/edit/", None, 5),
+        (
+            "post", "/posts/{post_id}/edit/",
+            {"title": "Заголовок", "text": "Текст",
+             "pub_date": "2020-01-01T10:00", "category": "{category_id}"}, 10
+        ),
+        ("get", "/posts/{post_id}/delete/", None, 4),
+        ("post", "/posts/{post_id}/delete/", None, 10),
+        ("get", "/category/{slug}/", None, 6),
+    ],
+)
+def test_num_queries(
+    user_client, objects, django_assert_num_queries,
+    method, url, data, expected
+):
+    url = url.format(**objects)
+    data = {
+        key: value.format(**objects) for key, value in (data or {}).items()
+    }
+    with django_assert_num_queries(expected):
+        response = getattr(user_client, method)(url, data)
+    assert response.status_code in (200, 302), (
+        f"Убедитесь, что страница `{url}` загружается без ошибок."
+    )
+
+
+def test_num_queries_anonymous_detail(
+    client, objects, django_assert_num_queries
+):
+    with django_assert_num_queries(2):
+        client.get(f"/posts/{objects['post_id']}/")
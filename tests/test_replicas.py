@@ -0,0 +1,97 @@
+import sqlite3
+
+import pytest
+from django.contrib.sessions.models import Session
+from django.db import connections
+from django.db.utils import ConnectionDoesNotExist
+from django.test import override_settings
+
+from blog.models import Post
+from blog.routers import ReplicaRouter, read_from_replicas
+
+pytestmark = [pytest.mark.django_db]
+
+# Псевдоним не описан в DATABASES: обращение к нему показывает, что
+# запрос ушёл бы в реплику.
+with_replica = override_settings(DATABASE_REPLICAS=["replica"])
+
+
+@with_replica
+def test_router():
+    router = ReplicaRouter()
+    assert router.db_for_read(Post) == "default"
+    with read_from_replicas():
+        assert router.db_for_read(Post) == "replica", (
+            "Убедитесь, что чтения списков и публикаций идут в реплику."
+        )
+        assert router.db_for_read(Session) == "default"
+        assert router.db_for_write(Post) == "default"
+    assert not router.allow_migrate("replica", "blog")
+
+
+@with_replica
+def test_reads_stick_to_primary_after_write(
+    user_client, post_with_published_location
+):
+    url = f"/posts/{post_with_published_location.id}/"
+    with pytest.raises(ConnectionDoesNotExist):
+        user_client.get(url)
+
+    user_client.post(f"{url}comment/", {"text": "Комментарий"})
+    response = user_client.get(url)
+    assert "Комментарий" in response.content.decode("utf-8"), (
+        "Убедитесь, что после записи сессия читает из основной базы."
+    )
+
+
+@pytest.fixture
+def lagging_replica(tmp_path, settings):
+    """Настоящий файл SQLite со снимком основной базы.
+
+    backup ждёт конца открытой транзакции, поэтому тесту нужна
+    django_db(transaction=True).
+    """
+    primary = connections["default"]
+    primary.ensure_connection()
+    path = tmp_path / "replica.sqlite3"
+    target = sqlite3.connect(path)
+    primary.connection.backup(target)
+    target.close()
+    connections.databases["lagging"] = {
+        **primary.settings_dict, "NAME": str(path)
+    }
+    settings.DATABASE_REPLICAS = ["lagging"]
+    yield
+    connections["lagging"].close()
+    del connections["lagging"]
+    del connections.databases["lagging"]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_lagging_replica_is_not_cached(
+    client, post_with_published_location, lagging_replica
+):
+    post = post_with_published_location
+    old_title = post.title
+    post.title = "Новый заголовок"
+    post.save()
+
+    response = client.get(f"/posts/{post.id}/")
+    assert old_title in response.content.decode("utf-8"), (
+        "Тест ожидает, что страница публикации читается из реплики."
+    )
+    assert not response.has_header("ETag") and not response.has_header(
+        "Last-Modified"
+    ), (
+        "Убедитесь, что ответ из отстающей реплики отдаётся без ETag и "
+        "Last-Modified."
+    )
+
+    for _ in range(2):
+        response = client.get("/")
+        content = response.content.decode("utf-8")
+        assert "Новый заголовок" in content and old_title not in content, (
+            "Убедитесь, что кэшируемые страницы отрисовываются из основной "
+            "базы, а не из отстающей реплики."
+        )
+        assert response.has_header("ETag")
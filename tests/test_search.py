@@ -0,0 +1,106 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+pytestmark = [pytest.mark.django_db]
+
+
+def search(client, query, **params):
+    response = client.get("/search/", {"q": query, **params})
+    assert response.status_code == 200, (
+        "Убедитесь, что страница поиска `/search/` загружается без ошибок."
+    )
+    return list(response.context["page_obj"])
+
+
+@pytest.fixture
+def searchable_posts(mixer, user, published_category, published_location):
+    def blend(title, text, **kwargs):
+        return mixer.blend(
+            "blog.Post",
+            title=title,
+            text=text,
+            author=user,
+            category=published_category,
+            location=published_location,
+            is_published=True,
+            pub_date=timezone.now() - timedelta(days=1),
+            **kwargs,
+        )
+
+    return {
+        "title": blend("Путешествие на Байкал", "Долгая дорога"),
+        "text": blend("Заметки", "Байкал зимой и байкальский лёд"),
+        "other": blend("Горы", "Эльбрус летом"),
+    }
+
+
+def test_search_finds_and_ranks_posts(client, searchable_posts):
+    found = search(client, "байкал")
+    assert set(found) == {
+        searchable_posts["title"], searchable_posts["text"]
+    }, "Убедитесь, что поиск ищет по заголовку и тексту публикации."
+    assert found[0] == searchable_posts["text"], (
+        "Убедитесь, что публикации с большим числом совпадений"
+        " показываются выше."
+    )
+    assert search(client, "байкал дорога") == [searchable_posts["title"]], (
+        "Убедитесь, что найденная публикация содержит все слова запроса."
+    )
+    assert search(client, "   ") == []
+
+
+def test_search_respects_visibility(
+    mixer, client, searchable_posts, published_category
+):
+    hidden = searchable_posts["title"]
+    hidden.is_published = False
+    hidden.save()
+    mixer.blend(
+        "blog.Post",
+        title="Байкал завтра",
+        category=published_category,
+        is_published=True,
+        pub_date=timezone.now() + timedelta(days=1),
+    )
+    assert search(client, "байкал") == [searchable_posts["text"]], (
+        "Убедитесь, что поиск показывает только опубликованные публикации"
+        " с наступившей датой."
+    )
+
+
+def test_search_index_follows_changes(client, searchable_posts):
+    post = searchable_posts["other"]
+    post.title = "Горный Алтай"
+    post.save()
+    assert search(client, "алтай") == [post], (
+        "Убедитесь, что изменённая публикация находится по новому"
+        " заголовку."
+    )
+    assert search(client, "горы") == []
+
+    post.delete()
+    assert search(client, "алтай") == []
+
+
+def test_search_pagination_keeps_query(
+    mixer, client, user, published_category
+):
+    mixer.cycle(12).blend(
+        "blog.Post",
+        title="Поход",
+        author=user,
+        category=published_category,
+        is_published=True,
+        pub_date=timezone.now() - timedelta(days=1),
+    )
+    response = client.get("/search/", {"q": "поход"})
+    page = response.context["page_obj"]
+    assert f"?q=%D0%BF%D0%BE%D1%85%D0%BE%D0%B4&amp;cursor={page.next_cursor}" in (
+        response.content.decode("utf-8")
+    ), "Убедитесь, что ссылки пагинации сохраняют поисковый запрос."
+    second = search(client, "поход", cursor=page.next_cursor)
+    assert len(second) == 2 and not set(second) & set(page), (
+        "Убедитесь, что вторая страница поиска продолжает первую."
+    )
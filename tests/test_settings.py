@@ -0,0 +1,63 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from django.conf import settings
+
+PROJECT_DIR = Path(settings.BASE_DIR)
+
+
+def load_settings(**env):
+    code = (
+        "import json, django; django.setup();"
+        "from django.conf import settings as s;"
+        "print(json.dumps({"
+        "'DEBUG': s.DEBUG, 'INSTALLED_APPS': s.INSTALLED_APPS,"
+        "'MIDDLEWARE': s.MIDDLEWARE,"
+        "'CONN_MAX_AGE': s.DATABASES['default']['CONN_MAX_AGE'],"
+        "'CACHE': s.CACHES['default']['BACKEND'],"
+        "'STATICFILES_STORAGE': s.STATICFILES_STORAGE}))"
+    )
+    # Значение None убирает переменную из окружения процесса.
+    env = {
+        name: value
+        for name, value in {
+            **os.environ,
+            "DJANGO_SETTINGS_MODULE": "blogicum.settings",
+            **env,
+        }.items()
+        if value is not None
+    }
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=PROJECT_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout)
+
+
+def test_dev_settings_by_default():
+    dev = load_settings(BLOGICUM_ENV=None)
+    assert dev["DEBUG"]
+    assert "debug_toolbar" in dev["INSTALLED_APPS"]
+
+
+def test_prod_settings():
+    prod = load_settings(BLOGICUM_ENV="prod", DJANGO_SECRET_KEY="secret")
+    assert not prod["DEBUG"]
+    assert "debug_toolbar" not in prod["INSTALLED_APPS"], (
+        "Убедитесь, что в боевых настройках нет django-debug-toolbar."
+    )
+    assert not any("debug_toolbar" in m for m in prod["MIDDLEWARE"])
+    assert prod["MIDDLEWARE"][0] == "django.middleware.gzip.GZipMiddleware"
+    assert "django.middleware.http.ConditionalGetMiddleware" in (
+        prod["MIDDLEWARE"]
+    )
+    assert prod["CONN_MAX_AGE"] > 0
+    assert "locmem" not in prod["CACHE"]
+    assert "Manifest" in prod["STATICFILES_STORAGE"]
@@ -0,0 +1,36 @@
+import pytest
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+
+from blog.db import apply_sqlite_pragmas
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.skipif(
+        connection.vendor != "sqlite", reason="Проверяются настройки SQLite."
+    ),
+]
+
+
+def pragma(name):
+    with connection.cursor() as cursor:
+        cursor.execute(f"PRAGMA {name}")
+        return cursor.fetchone()[0]
+
+
+def test_pragmas_applied_on_connect():
+    connection.close()
+    connection.ensure_connection()
+    pragmas = settings.SQLITE_PRAGMAS
+    assert pragma("busy_timeout") == pragmas["busy_timeout"], (
+        "Убедитесь, что PRAGMA из SQLITE_PRAGMAS выполняются"
+        " при подключении к базе."
+    )
+    assert pragma("cache_size") == pragmas["cache_size"]
+    assert pragma("synchronous") == 1, "Ожидается synchronous = NORMAL."
+
+
+def test_invalid_pragma_rejected():
+    with pytest.raises(ImproperlyConfigured):
+        apply_sqlite_pragmas(connection, {"cache_size": "1; DROP TABLE x"})
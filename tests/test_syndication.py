@@ -0,0 +1,81 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.utils import timezone
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def feed_urls(user, published_category):
+    return {
+        "index": "/feed/",
+        "category": f"/category/{published_category.slug}/feed/",
+        "profile": f"/profile/{user.username}/feed/",
+    }
+
+
+@pytest.mark.parametrize("url_name", ["index", "category", "profile"])
+@pytest.mark.parametrize("suffix,content_type", [
+    ("", "application/rss+xml"), ("atom/", "application/atom+xml")
+])
+def test_feeds_show_visible_posts(
+    mixer, client, user, published_category, post_with_published_location,
+    feed_urls, url_name, suffix, content_type
+):
+    mixer.blend(
+        "blog.Post",
+        title="Завтрашняя публикация",
+        author=user,
+        category=published_category,
+        is_published=True,
+        pub_date=timezone.now() + timedelta(days=1),
+    )
+    response = client.get(feed_urls[url_name] + suffix)
+    assert response.status_code == HTTPStatus.OK
+    assert response["Content-Type"].startswith(content_type)
+    content = response.content.decode("utf-8")
+    assert post_with_published_location.title in content, (
+        "Убедитесь, что в ленте RSS/Atom есть опубликованные публикации."
+    )
+    assert "Завтрашняя публикация" not in content, (
+        "Убедитесь, что лента RSS/Atom показывает публикации по тем же"
+        " правилам, что и страницы лент."
+    )
+
+
+def test_unpublished_category_feed_not_found(mixer, client):
+    slug = mixer.blend("blog.Category", is_published=False).slug
+    assert client.get(f"/category/{slug}/feed/").status_code == (
+        HTTPStatus.NOT_FOUND
+    )
+
+
+def test_feed_cached_and_revalidated(
+    client, django_assert_num_queries, post_with_published_location
+):
+    post = post_with_published_location
+    response = client.get("/feed/")
+    with django_assert_num_queries(0):
+        assert client.get("/feed/").content == response.content, (
+            "Убедитесь, что лента RSS берётся из кэша."
+        )
+        assert client.get(
+            "/feed/", HTTP_IF_NONE_MATCH=response["ETag"]
+        ).status_code == HTTPStatus.NOT_MODIFIED
+
+    post.title = "Обновлённый заголовок"
+    post.save()
+    response = client.get("/feed/", HTTP_IF_NONE_MATCH=response["ETag"])
+    assert "Обновлённый заголовок" in response.content.decode("utf-8"), (
+        "Убедитесь, что изменение публикации сбрасывает кэш ленты RSS."
+    )
+
+
+def test_feed_cache_depends_on_host(client, post_with_published_location):
+    for host in ("localhost", "127.0.0.1", "localhost"):
+        content = client.get("/feed/", HTTP_HOST=host).content.decode("utf-8")
+        assert f"http://{host}/posts/" in content, (
+            "Убедитесь, что лента из кэша содержит ссылки на хост запроса."
+        )
@@ -0,0 +1,31 @@
+import io
+
+import pytest
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.test import override_settings
+
+from blog.templating import precompile_templates, template_names
+
+
+def test_precompile_project_templates():
+    assert precompile_templates() == len(
+        template_names(settings.TEMPLATES_DIR)
+    ), "Убедитесь, что все шаблоны проекта компилируются без ошибок."
+
+
+def test_precompile_fails_fast(tmp_path):
+    (tmp_path / "broken.html").write_text("{% if %}", encoding="utf-8")
+    with override_settings(TEMPLATES=[{
+        **settings.TEMPLATES[0], "DIRS": [tmp_path]
+    }]):
+        with pytest.raises(ImproperlyConfigured, match="broken.html"):
+            precompile_templates()
+
+
+@pytest.mark.django_db
+def test_bench_templates(post_with_published_location):
+    out = io.StringIO()
+    call_command("bench_templates", repeat=2, stdout=out)
+    assert "blog/detail.html: ускорение" in out.getvalue()
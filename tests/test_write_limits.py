@@ -0,0 +1,126 @@
+import threading
+import time
+from http import HTTPStatus
+from urllib.parse import urlencode
+from unittest import mock
+
+import pytest
+from django.db import connection
+from django.contrib.sessions.backends.db import SessionStore
+from django.test import AsyncRequestFactory, Client, override_settings
+from django.utils import timezone
+
+from blog.cache import get_write_stats
+from blog.comments import save_comments
+from blog.models import Comment
+from blog.ratelimit import take_token
+from blog.views import CommentCreateView
+
+
+def test_token_bucket_refills():
+    key = "test:bucket"
+    assert take_token(key, burst=1, per_minute=60, now=100) == (True, 0)
+    allowed, retry_after = take_token(key, burst=1, per_minute=60, now=100.5)
+    assert not allowed and retry_after == pytest.approx(0.5), (
+        "Убедитесь, что пустая корзина сообщает, когда появится жетон."
+    )
+    assert take_token(key, burst=1, per_minute=60, now=101.5)[0]
+
+
+@pytest.mark.django_db
+@override_settings(RATE_LIMITS={"comment": {"burst": 2, "per_minute": 1}})
+def test_comment_rate_limited(user_client, post_with_published_location):
+    url = f"/posts/{post_with_published_location.id}/comment/"
+    for _ in range(2):
+        assert user_client.post(url, {"text": "Комментарий"}).status_code == (
+            HTTPStatus.FOUND
+        )
+    response = user_client.post(url, {"text": "Комментарий"})
+    assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+        "Убедитесь, что частые комментарии отклоняются со статусом 429."
+    )
+    assert int(response["Retry-After"]) > 0
+    assert Comment.objects.count() == 2
+    assert get_write_stats()["rate_limited"] == 1
+    assert user_client.get(
+        f"/posts/{post_with_published_location.id}/"
+    ).status_code == HTTPStatus.OK, "Чтение не должно ограничиваться."
+
+
+@pytest.mark.django_db(transaction=True)
+@override_settings(COMMENT_COALESCING=True, COMMENT_COALESCE_DELAY=0.5)
+def test_concurrent_comments_coalesced(user, post_with_published_location):
+    post = post_with_published_location
+    writers = 5
+    statuses = []
+
+    def write(client, index):
+        statuses.append(client.post(
+            f"/posts/{post.id}/comment/", {"text": f"Комментарий {index}"}
+        ).status_code)
+        connection.close()
+
+    clients = [Client() for _ in range(writers)]
+    for client in clients:
+        client.force_login(user)
+    threads = [
+        threading.Thread(target=write, args=(client, index))
+        for index, client in enumerate(clients)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert statuses == [HTTPStatus.FOUND] * writers
+    assert Comment.objects.filter(post=post).count() == writers
+    post.refresh_from_db()
+    assert post.comment_count == writers, (
+        "Убедитесь, что пачка комментариев обновляет счётчик публикации."
+    )
+    stats = get_write_stats()
+    assert stats["coalesced"] == writers
+    assert stats["batches"] < writers, (
+        "Убедитесь, что параллельные комментарии записываются пачками."
+    )
+
+
+@pytest.mark.django_db
+def test_saved_comments_get_pks(user, post_with_published_location):
+    comments = [
+        Comment(post=post_with_published_location, author=user, text=text)
+        for text in ("Первый", "Второй")
+    ]
+    # Двойная отправка: одинаковые автор, публикация и время создания.
+    with mock.patch(
+        "django.utils.timezone.now", return_value=timezone.now()
+    ):
+        save_comments(comments)
+    assert [
+        Comment.objects.get(pk=comment.pk).text for comment in comments
+    ] == ["Первый", "Второй"], (
+        "Убедитесь, что комментарии, записанные пачкой, получают ключи."
+    )
+    post_with_published_location.refresh_from_db()
+    assert post_with_published_location.comment_count == 2
+
+
+@pytest.mark.django_db
+@override_settings(COMMENT_COALESCING=True, COMMENT_COALESCE_DELAY=5)
+def test_asgi_comments_not_coalesced(user, post_with_published_location):
+    post = post_with_published_location
+    request = AsyncRequestFactory().post(
+        f"/posts/{post.id}/comment/", urlencode({"text": "Комментарий"}),
+        content_type="application/x-www-form-urlencoded"
+    )
+    request.user = user
+    request.session = SessionStore()
+    started = time.monotonic()
+    response = CommentCreateView.as_view()(request, post_id=post.id)
+    assert response.status_code == HTTPStatus.FOUND
+    assert time.monotonic() - started < 1, (
+        "Убедитесь, что под ASGI комментарий не ждёт пачку: к ней "
+        "некому присоединиться."
+    )
+    assert Comment.objects.filter(post=post).count() == 1
+    assert get_write_stats()["coalesced"] == 0